@@ -3,202 +3,2283 @@ Cricket Statistics Analysis Functions
 This module contains all the data analysis and statistical calculation functions
 """
 
+import functools
+import glob
+import inspect
+import os
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+
 import pandas as pd
 import numpy as np
 
+import data_cache
+import schema
+from lru_cache import LRUCache
+
+
+# ==================== DATA LOADING FUNCTIONS ====================
+
+MATCHES_CSV = 'data/matches.csv'
+DELIVERIES_CSV = 'data/deliveries.csv'
+REPORT_DIR = 'data/reports'
+
+# Sorted player, team and season lists, stored next to the columnar cache
+NAMES_DIR = os.path.join(data_cache.CACHE_DIR, 'names')
+
+# Deliveries columns read by the innings, phase and matchup tables, and
+# matches columns read by the season filters and team tables (see uses_columns)
+BATTING_COLUMNS = ['match_id', 'inning', 'batter', 'batsman_runs', 'extras_type', 'is_wicket', 'player_dismissed']
+BOWLING_COLUMNS = ['match_id', 'inning', 'bowler', 'total_runs', 'extras_type', 'is_wicket', 'dismissal_kind']
+PHASE_COLUMNS = ['over', 'batting_team', 'bowling_team', 'batter', 'bowler', 'batsman_runs', 'total_runs',
+                 'extras_type', 'is_wicket', 'player_dismissed']
+MATCHUP_COLUMNS = ['batter', 'bowler', 'batsman_runs', 'extras_type', 'is_wicket', 'dismissal_kind']
+PERIOD_COLUMNS = ['id', 'season', 'date']
+TEAM_COLUMNS = ['season', 'date', 'team1', 'team2', 'winner']
+
+# CSV file, dtypes and match id column of each file of the dataset
+SOURCES = {
+    'matches': (MATCHES_CSV, schema.MATCHES_SCHEMA, 'id'),
+    'deliveries': (DELIVERIES_CSV, schema.DELIVERIES_SCHEMA, 'match_id'),
+}
+
+# The dataset shared by every page, loaded column by column on first use
+# and kept once per server process
+_DATASET = {'signature': None, 'digests': {}, 'layout': {}, 'dtypes': {}, 'columns': {}, 'frames': {},
+            'names': None}
+_DATASET_LOCK = threading.Lock()
+
+
+def load_data():
+    """
+    Load matches and deliveries data from CSV files
+    
+    The CSVs are read with the dtypes declared in schema.py, through the
+    columnar cache in data/.cache, which is rebuilt automatically whenever
+    a CSV file changes.
+    
+    Returns:
+        tuple: (matches_df, deliveries_df)
+    """
+    try:
+        matches = data_cache.read_csv_cached(MATCHES_CSV, dtype=schema.MATCHES_SCHEMA)
+        deliveries = data_cache.read_csv_cached(DELIVERIES_CSV, dtype=schema.DELIVERIES_SCHEMA)
+        matches, deliveries = encode_names(matches, deliveries)
+        _source_version(matches, data_cache.source_digest(MATCHES_CSV, dtype=schema.MATCHES_SCHEMA))
+        _source_version(deliveries, data_cache.source_digest(DELIVERIES_CSV, dtype=schema.DELIVERIES_SCHEMA))
+        return matches, deliveries
+    except FileNotFoundError:
+        return None, None
+
+
+def get_dataset():
+    """
+    Get the shared matches and deliveries data with all columns
+    
+    Unlike load_data(), every caller in the process gets the same data,
+    which is only reloaded when a CSV file changes. Pages that only need
+    some columns should use get_matches() and get_deliveries() instead.
+    The frames are shared between pages and sessions, so they must be
+    treated as read-only.
+    
+    Returns:
+        tuple: (matches_df, deliveries_df), or (None, None) if files are missing
+    """
+    matches_df = get_matches()
+    deliveries_df = get_deliveries()
+    if matches_df is None or deliveries_df is None:
+        return None, None
+    return matches_df, deliveries_df
+
+
+def get_matches(*functions):
+    """
+    Get the shared matches data with the columns some analysis functions need
+    
+    Only columns that were not loaded before are read from the cache, so
+    a page pays for the columns it uses. The returned DataFrame may hold
+    more columns than asked for (all columns loaded so far) and has the
+    same dataset_version() whatever columns it holds.
+    
+    Parameters:
+        *functions: Analysis functions that will be called with the data
+                    (default: load all columns)
+    
+    Returns:
+        DataFrame with match-level data, or None if the files are missing
+    """
+    return _get_columns('matches', functions)
+
+
+def get_deliveries(*functions):
+    """
+    Get the shared deliveries data with the columns some analysis functions need
+    
+    Parameters:
+        *functions: Analysis functions that will be called with the data
+                    (default: load all columns)
+    
+    Returns:
+        DataFrame with ball-by-ball data, or None if the files are missing
+    """
+    return _get_columns('deliveries', functions)
+
+
+def get_names(kind):
+    """
+    Get the sorted players, teams or seasons of the shared dataset
+    
+    The lists are saved in data/.cache/names the first time they are built
+    from the data, so later server processes read three small JSON files
+    instead of loading and scanning name columns. Pages can fill their
+    selectboxes before any column is loaded.
+    
+    Parameters:
+        kind: 'players', 'teams' or 'seasons'
+    
+    Returns:
+        List equal to get_all_players(), get_all_teams() or get_seasons(),
+        or None if the files are missing
+    """
+    with _DATASET_LOCK:
+        try:
+            _refresh_dataset()
+        except FileNotFoundError:
+            return None
+        names = _DATASET['names']
+    
+    if names is None:
+        names = _load_names()
+        if names is None:
+            return None
+        with _DATASET_LOCK:
+            _DATASET['names'] = names
+    
+    return list(names[kind])
+
+
+def _load_names():
+    """Read the saved name lists, or build and save them if they are stale"""
+    try:
+        meta, names = data_cache.read_artifacts(NAMES_DIR)
+        if all(data_cache.source_matches(csv_path, meta['sources'][csv_path])
+               for csv_path, _, _ in SOURCES.values()):
+            return names
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    matches_df = get_matches(get_all_teams, get_seasons)
+    deliveries_df = get_deliveries(get_all_players)
+    if matches_df is None or deliveries_df is None:
+        return None
+    
+    names = {
+        'players': get_all_players(deliveries_df),
+        'teams': get_all_teams(matches_df),
+        'seasons': get_seasons(matches_df),
+    }
+    try:
+        data_cache.write_artifacts(names, NAMES_DIR, meta={
+            'sources': {csv_path: data_cache.describe_source(csv_path) for csv_path, _, _ in SOURCES.values()},
+        })
+    except OSError:
+        # A read-only data folder still works, the lists are just rebuilt
+        pass
+    return names
+
+
+def uses_columns(matches=(), deliveries=()):
+    """
+    Decorator that declares the columns an analysis function reads
+    
+    get_matches() and get_deliveries() load the declared columns (plus the
+    match id column) before the function is called. Functions without a
+    declaration get all columns.
+    
+    Parameters:
+        matches: Columns of the matches data the function reads
+        deliveries: Columns of the deliveries data the function reads
+    
+    Returns:
+        Decorator that records the columns on the function
+    """
+    def decorator(func):
+        func.dataset_columns = {'matches': list(matches), 'deliveries': list(deliveries)}
+        return func
+    return decorator
+
+
+def _get_columns(name, functions):
+    """Shared DataFrame of one file with the columns needed by some functions"""
+    with _DATASET_LOCK:
+        try:
+            _refresh_dataset()
+        except FileNotFoundError:
+            return None
+    
+        layout = _DATASET['layout'][name]
+        loaded = _DATASET['columns'][name]
+        missing = [column for column in _needed_columns(name, functions) if column not in loaded]
+    
+        if missing or name not in _DATASET['frames']:
+            csv_path, dtype, _ = SOURCES[name]
+            new = data_cache.read_csv_cached(csv_path, dtype=dtype, columns=missing)
+            for column in missing:
+                # Name columns get the categories of their shared vocabulary
+                name_dtype = _DATASET['dtypes'].get((name, column))
+                loaded[column] = new[column] if name_dtype is None else _recode_names(new[column], name_dtype)
+    
+            first_load = name not in _DATASET['frames']
+            _DATASET['frames'][name] = pd.DataFrame({column: loaded[column] for column in layout if column in loaded})
+            _source_version(_DATASET['frames'][name], _DATASET['digests'][name])
+            if first_load:
+                # League tables precomputed by report.py, if they match the data
+                load_report(**{f'{name}_df': _DATASET['frames'][name]})
+    
+        return _DATASET['frames'][name]
+
+
+def _refresh_dataset():
+    """Forget the loaded columns if a CSV file changed since they were loaded"""
+    signature = tuple(
+        tuple(data_cache.source_signature(csv_path).values())
+        for csv_path, _, _ in SOURCES.values()
+    )
+    if _DATASET['signature'] == signature:
+        return
+    
+    # Tables and results built from the old files are never asked for again
+    clear_derived()
+    
+    # Only the cache manifests are read: the columns and their distinct values
+    layout = {
+        name: data_cache.read_csv_columns(csv_path, dtype=dtype)
+        for name, (csv_path, dtype, _) in SOURCES.items()
+    }
+    vocabularies = load_vocabularies(layout)
+    _DATASET.update({
+        'signature': signature,
+        'digests': {
+            name: data_cache.source_digest(csv_path, dtype=dtype)
+            for name, (csv_path, dtype, _) in SOURCES.items()
+        },
+        'layout': {name: list(columns) for name, columns in layout.items()},
+        'dtypes': {
+            (name, column): pd.CategoricalDtype(vocabularies[vocabulary])
+            for vocabulary, files in schema.VOCABULARIES.items()
+            for name, columns in files.items()
+            for column in columns
+        },
+        'columns': {name: {} for name in SOURCES},
+        'frames': {},
+        'names': None,
+    })
+
+
+def _needed_columns(name, functions):
+    """Columns of one file needed by some analysis functions, in file order"""
+    layout = _DATASET['layout'][name]
+    if not functions:
+        return layout
+    
+    # The match id column is always loaded, it identifies the rows
+    needed = {SOURCES[name][2]}
+    for function in functions:
+        columns = getattr(function, 'dataset_columns', None)
+        if columns is None:
+            return layout
+        needed.update(columns[name])
+    return [column for column in layout if column in needed]
+
+
+# ==================== NAME ENCODING FUNCTIONS ====================
+
+def build_vocabularies(matches_df, deliveries_df):
+    """
+    Build the sorted vocabularies of player, team and venue names
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Dictionary mapping vocabulary name (see schema.VOCABULARIES) to a
+        sorted Index of names; a name's position is its code
+    """
+    frames = {'matches': matches_df, 'deliveries': deliveries_df}
+    vocabularies = {}
+    
+    for vocabulary, columns in schema.VOCABULARIES.items():
+        names = set()
+        for frame_name, frame_columns in columns.items():
+            frame = frames[frame_name]
+            for column in frame_columns:
+                if column not in frame.columns:
+                    continue
+                series = frame[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    # The categories already are the distinct names
+                    names.update(series.cat.categories)
+                else:
+                    names.update(series.dropna().unique())
+        vocabularies[vocabulary] = pd.Index(sorted(names))
+    
+    return vocabularies
+
+
+def load_vocabularies(layout=None):
+    """
+    Build the vocabularies of the CSV files without loading any column
+    
+    The distinct names of every column are stored in the cache manifests,
+    so this gives the same result as build_vocabularies() on the loaded
+    data.
+    
+    Parameters:
+        layout: Dictionary mapping 'matches' and 'deliveries' to the
+                data_cache.read_csv_columns() result of the file (default:
+                read from the cache)
+    
+    Returns:
+        Dictionary mapping vocabulary name to a sorted Index of names
+    """
+    if layout is None:
+        layout = {
+            name: data_cache.read_csv_columns(csv_path, dtype=dtype)
+            for name, (csv_path, dtype, _) in SOURCES.items()
+        }
+    
+    vocabularies = {}
+    for vocabulary, columns in schema.VOCABULARIES.items():
+        names = set()
+        for frame_name, frame_columns in columns.items():
+            for column in frame_columns:
+                names.update(layout[frame_name].get(column) or [])
+        vocabularies[vocabulary] = pd.Index(sorted(names))
+    
+    return vocabularies
+
+
+def encode_names(matches_df, deliveries_df, vocabularies=None):
+    """
+    Give all name columns of a vocabulary the same categorical dtype
+    
+    Afterwards a name has the same integer code in every column of its
+    vocabulary, so columns can be compared, joined and counted on codes and
+    names are only decoded when a table is displayed.
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+        vocabularies: Vocabularies from build_vocabularies (default: built
+                      from the two DataFrames)
+    
+    Returns:
+        tuple: (matches_df, deliveries_df) with encoded name columns
+    """
+    if vocabularies is None:
+        vocabularies = build_vocabularies(matches_df, deliveries_df)
+    
+    frames = {'matches': matches_df, 'deliveries': deliveries_df}
+    for vocabulary, columns in schema.VOCABULARIES.items():
+        dtype = pd.CategoricalDtype(vocabularies[vocabulary])
+        for frame_name, frame_columns in columns.items():
+            frame = frames[frame_name]
+            encoded = {
+                column: _recode_names(frame[column], dtype)
+                for column in frame_columns
+                if column in frame.columns
+            }
+            if encoded:
+                frames[frame_name] = frame.assign(**encoded)
+    
+    return frames['matches'], frames['deliveries']
+
+
+def _recode_names(values, dtype):
+    """Give a name column a categorical dtype; names missing from it become NaN"""
+    if isinstance(dtype, pd.Series):
+        dtype = dtype.dtype
+    if not isinstance(dtype, pd.CategoricalDtype):
+        return values.astype(object).to_numpy()
+    if values.dtype == dtype:
+        return values
+    
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Look up each category once instead of every row
+        lookup = np.append(dtype.categories.get_indexer(values.cat.categories), -1)
+        codes = lookup[values.cat.codes.to_numpy()]
+    else:
+        codes = dtype.categories.get_indexer(values.astype(object))
+    return pd.Categorical.from_codes(codes, dtype=dtype)
+
+
+def _used_names(columns):
+    """
+    Sorted names that occur in any of the given columns
+    
+    Columns of one encoded vocabulary are answered from their codes, without
+    touching the names.
+    """
+    dtypes = {series.dtype for series in columns}
+    if len(dtypes) == 1 and isinstance(columns[0].dtype, pd.CategoricalDtype):
+        categories = columns[0].cat.categories
+        # The extra last slot takes the -1 code of missing names
+        used = np.zeros(len(categories) + 1, dtype=bool)
+        for series in columns:
+            used[series.cat.codes.to_numpy()] = True
+        names = categories[used[:-1]]
+        # Vocabularies are sorted, categories read from a file may not be
+        return names if names.is_monotonic_increasing else names.sort_values()
+    
+    names = set()
+    for series in columns:
+        names.update(series.dropna().unique())
+    return pd.Index(sorted(names))
+
+
+def _shared_codes(columns):
+    """
+    Codes of several name columns in one sorted index of the names they use
+    
+    Returns:
+        tuple: (list of code arrays with -1 for missing names, Index of names)
+    """
+    labels = _used_names(columns)
+    return [_codes_in(series, labels) for series in columns], labels
+
+
+# ==================== DATASET INDEX FUNCTIONS ====================
+
+# Indexes and tables derived from a dataset are built once per dataset
+# version and kept here, so later calls on the same data reuse them
+_DERIVED = OrderedDict()
+_MAX_DATASET_VERSIONS = 4
+
+# Guards _DERIVED; tables are built outside it, one thread per table while
+# the others wait in its entry of _BUILD_LOCKS
+_DERIVED_LOCK = threading.Lock()
+_BUILD_LOCKS = {}
+
+# Fingerprints of live DataFrames: id -> (weak reference, shape, version)
+_VERSIONS = {}
+
+
+def dataset_version(df):
+    """
+    Get a fingerprint of the data in a DataFrame
+    
+    Frames loaded by load_data(), get_matches() and get_deliveries() are
+    identified by the content hash of their CSV file, so DataFrames holding
+    different columns of the same file share a version and an edited file
+    gets a new one. Any other DataFrame is identified by a hash of all its
+    values, column names and index. The version is remembered for as long
+    as the DataFrame exists (and keeps its shape), so asking again for the
+    same DataFrame costs a dictionary lookup; DataFrames must therefore not
+    be modified in place.
+    
+    Parameters:
+        df: matches or deliveries DataFrame
+    
+    Returns:
+        String identifying the dataset version
+    """
+    entry = _VERSIONS.get(id(df))
+    if entry is not None and entry[0]() is df and entry[1] == df.shape:
+        return entry[2]
+    
+    version = _fingerprint(df)
+    _set_version(df, version)
+    return version
+
+
+def _set_version(df, version):
+    """Remember the version of a live DataFrame"""
+    key = id(df)
+    _VERSIONS[key] = (weakref.ref(df, lambda _: _VERSIONS.pop(key, None)), df.shape, version)
+
+
+def _source_version(df, digest):
+    """Version of a DataFrame read from a CSV file with the given content hash"""
+    version = f'{len(df)}-{digest[:12]}'
+    _set_version(df, version)
+    return version
+
+
+def _fingerprint(df):
+    """Checksum of the values, column names and index of a DataFrame"""
+    names = tuple(df.columns) if isinstance(df, pd.DataFrame) else (df.name,)
+    checksum = zlib.crc32(repr(names).encode())
+    hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    checksum = zlib.crc32(np.ascontiguousarray(hashes), checksum)
+    return f'{len(df)}-{checksum:08x}'
+
+
+def get_derived(df, name, build):
+    """
+    Get a table derived from a DataFrame, building it on first use
+    
+    Parameters:
+        df: DataFrame the table is derived from
+        name: Name of the derived table
+        build: Function that builds the table from df
+    
+    Returns:
+        The derived table
+    """
+    version = dataset_version(df)
+    
+    with _DERIVED_LOCK:
+        if version in _DERIVED:
+            _DERIVED.move_to_end(version)
+        else:
+            _DERIVED[version] = {}
+            # Forget the least recently used dataset versions
+            while len(_DERIVED) > _MAX_DATASET_VERSIONS:
+                _DERIVED.popitem(last=False)
+        
+        tables = _DERIVED[version]
+        if name in tables:
+            return tables[name]
+        build_lock = _BUILD_LOCKS.setdefault((version, name), threading.Lock())
+    
+    # Builds may ask for other derived tables, so only this table is locked
+    with build_lock:
+        with _DERIVED_LOCK:
+            if name in tables:
+                return tables[name]
+        
+        table = build(df)
+        with _DERIVED_LOCK:
+            tables[name] = table
+            _BUILD_LOCKS.pop((version, name), None)
+    return table
+
+
+def clear_derived():
+    """Forget all derived tables and memoized results, so the next calls rebuild them"""
+    with _DERIVED_LOCK:
+        _DERIVED.clear()
+    clear_memoized()
+
+
+# ==================== MEMOIZATION FUNCTIONS ====================
+
+# Results of memoized functions, one bounded cache per function
+_MEMOIZED = {}
+MEMO_SIZE = 256
+
+# Marks a cache miss (None is a valid result)
+_MISSING = object()
+
+
+def memoize(func=None, maxsize=MEMO_SIZE):
+    """
+    Decorator that caches the results of an analysis function
+    
+    DataFrame arguments are keyed by their dataset_version() instead of
+    their contents, and lists by their items, so repeated calls with the
+    same data and parameters (across reruns and sessions) are answered from
+    a bounded LRU cache. Calls with other unhashable arguments are not
+    cached. Every call gets its own copy of a cached DataFrame, Series,
+    dict or list, also when they are returned in a tuple.
+    
+    Parameters:
+        func: Function to wrap
+        maxsize: Results kept for this function (default: MEMO_SIZE)
+    
+    Returns:
+        Wrapped function
+    """
+    if func is None:
+        return functools.partial(memoize, maxsize=maxsize)
+    
+    cache = LRUCache(maxsize)
+    _MEMOIZED[func.__name__] = cache
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _memo_key(signature, args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(*args, **kwargs)
+            cache.put(key, result)
+        return _copy_result(result)
+    
+    wrapper.cache = cache
+    return wrapper
+
+
+def clear_memoized():
+    """Forget the results of all memoized functions"""
+    for cache in _MEMOIZED.values():
+        cache.clear()
+
+
+def get_memo_stats():
+    """
+    Get the size and hit rate of the cache of every memoized function
+    
+    Returns:
+        Dictionary mapping function name to the LRUCache.stats() dictionary
+    """
+    return {name: cache.stats() for name, cache in _MEMOIZED.items()}
+
+
+def _memo_key(signature, args, kwargs):
+    """Memoization key of a call, or None if it cannot be memoized"""
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(_memo_value(value) for value in bound.arguments.values())
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _memo_value(value):
+    """Hashable stand-in for an argument value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return ('dataset', dataset_version(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_memo_value(item) for item in value)
+    return value
+
+
+def _copy_result(result):
+    """Copy of a cached result, so callers cannot change the cached one"""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy()
+    if isinstance(result, (dict, list)):
+        return type(result)(result)
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    return result
+
+
+def preload_derived(df, name, table):
+    """
+    Store a derived table that was built elsewhere (e.g. read from a report)
+    
+    Parameters:
+        df: DataFrame the table is derived from
+        name: Name of the derived table
+        table: The derived table, as the get_derived() build would return it
+    """
+    get_derived(df, name, lambda _: table)
+
+
+# Derived tables written by report.py and preloaded by get_dataset(), so the
+# app does not build the league-wide tables on the first request
+REPORT_TABLES = {
+    'matches': ['team_table', 'venue_table', 'season_matches', 'season_winners', 'toss_impact',
+                'head_to_head_matrix'],
+    'deliveries': ['players', 'batting_table', 'bowling_table', 'batting_milestones', 'bowling_milestones',
+                   'batting_innings', 'bowling_innings', 'phase_cube', 'matchup_matrix'],
+}
+
+# Tables of REPORT_TABLES that report.py saves as .npz arrays, which read
+# back faster than the tables are built
+REPORT_ARRAYS = ['head_to_head_matrix', 'batting_innings', 'bowling_innings', 'phase_cube', 'matchup_matrix']
+
+
+def _share_names(table, frame_name, df):
+    """Give the name columns of a preloaded table the categories of the same columns of the data"""
+    if not isinstance(table, pd.DataFrame):
+        return table
+    
+    columns = {}
+    for column, values in table.items():
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        # The column may not be loaded yet, its vocabulary is known anyway
+        dtype = df[column].dtype if column in df.columns else _DATASET['dtypes'].get((frame_name, column))
+        if dtype is not None:
+            columns[column] = _recode_names(values, dtype)
+    return table.assign(**columns) if columns else table
+
+
+def report_path(matches_df, deliveries_df, report_dir=REPORT_DIR):
+    """
+    Get the directory of the report of a dataset version
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+        report_dir: Directory holding all reports
+    
+    Returns:
+        Path of the report directory
+    """
+    return os.path.join(report_dir, f'{dataset_version(matches_df)}_{dataset_version(deliveries_df)}')
+
+
+def load_report(matches_df=None, deliveries_df=None, report_dir=REPORT_DIR):
+    """
+    Preload the derived tables of a report written by report.py
+    
+    The report is only used if it was built from the current CSV files;
+    a missing, stale or unreadable report is ignored and the tables are
+    built on first use as usual. Either DataFrame may be left out, to
+    preload only the tables of the other one.
+    
+    Parameters:
+        matches_df: DataFrame with match-level data (optional)
+        deliveries_df: DataFrame with ball-by-ball data (optional)
+        report_dir: Directory holding all reports
+    
+    Returns:
+        Number of tables preloaded
+    """
+    frames = {'matches': matches_df, 'deliveries': deliveries_df}
+    names = [
+        name
+        for frame_name, frame_names in REPORT_TABLES.items() if frames[frame_name] is not None
+        for name in frame_names
+    ]
+    versions = [dataset_version(df) if df is not None else '*' for df in (matches_df, deliveries_df)]
+    
+    for path in sorted(glob.glob(os.path.join(report_dir, '_'.join(versions)))):
+        try:
+            meta, artifacts = data_cache.read_artifacts(path, names)
+            sources = meta['sources']
+        except (OSError, ValueError, KeyError):
+            continue
+        
+        if not all(data_cache.source_matches(csv_path, source) for csv_path, source in sources.items()):
+            continue
+        
+        loaded = 0
+        for frame_name, frame_names in REPORT_TABLES.items():
+            for name in frame_names:
+                if name in artifacts and frames[frame_name] is not None:
+                    table = _share_names(artifacts[name], frame_name, frames[frame_name])
+                    preload_derived(frames[frame_name], name, table)
+                    loaded += 1
+        return loaded
+    
+    return 0
+
+
+# ==================== INNINGS TABLE FUNCTIONS ====================
+
+# Dismissals that are not credited to the bowler
+NON_BOWLER_DISMISSALS = ['run out', 'retired hurt', 'retired out', 'obstructing the field']
+
+
+def get_batting_innings(deliveries_df):
+    """
+    Get the batting innings table, building it on first use
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Shared DataFrame from build_batting_innings
+    """
+    return get_derived(deliveries_df, 'batting_innings', build_batting_innings)
+
+
+def get_bowling_innings(deliveries_df):
+    """
+    Get the bowling innings table, building it on first use
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Shared DataFrame from build_bowling_innings
+    """
+    return get_derived(deliveries_df, 'bowling_innings', build_bowling_innings)
+
+
+def build_player_index(innings, player_column):
+    """
+    Build the row positions of every player in an innings table
+    
+    Parameters:
+        innings: DataFrame from build_batting_innings or build_bowling_innings
+        player_column: 'batter' or 'bowler'
+    
+    Returns:
+        Dictionary mapping player name to row positions
+    """
+    return innings.groupby(player_column, observed=True).indices
+
+
+def get_player_innings(deliveries_df, player_name, role='batter'):
+    """
+    Get the innings of one player using the player index
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Name of the player
+        role: 'batter' or 'bowler' (default: 'batter')
+    
+    Returns:
+        Rows of the shared batting or bowling innings table of the player
+    """
+    if role == 'batter':
+        innings = get_batting_innings(deliveries_df)
+    else:
+        innings = get_bowling_innings(deliveries_df)
+    
+    player_index = get_derived(
+        deliveries_df, f'{role}_index', lambda _: build_player_index(innings, role)
+    )
+    return innings.take(player_index.get(player_name, []))
+
+
+def _key_codes(values, uniques=None):
+    """
+    Number the values of a key column in sorted order
+    
+    Parameters:
+        values: Key column, categorical columns keep their category order
+        uniques: Values to number against, from an earlier call (optional)
+    
+    Returns:
+        tuple: (int64 code of every value, -1 where missing; the values of
+                the codes)
+    """
+    if uniques is not None:
+        if isinstance(uniques.dtype, pd.CategoricalDtype):
+            codes = pd.Series(_recode_names(values, uniques.dtype)).cat.codes.to_numpy()
+        else:
+            codes = pd.Index(uniques).get_indexer(values)
+    elif isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = pd.Categorical.from_codes(np.arange(len(values.dtype.categories)), dtype=values.dtype)
+    elif values.dtype.kind in 'iu' and len(values) and int(values.max()) - int(values.min()) < 2 ** 22:
+        # Integers in a small range (ids, innings) are numbered by their offset, without hashing
+        low, high = int(values.min()), int(values.max())
+        codes = np.asarray(values).astype(np.int64) - low
+        uniques = np.arange(low, high + 1).astype(values.dtype)
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), uniques
+
+
+def _combine_codes(codes, uniques):
+    """Combine the codes of several key columns into one key per row, -1 where any is missing"""
+    keys = np.zeros(len(codes[0]), dtype=np.int64)
+    missing = np.zeros(len(keys), dtype=bool)
+    for column_codes, column_uniques in zip(codes, uniques):
+        keys = keys * len(column_uniques) + column_codes
+        missing |= column_codes < 0
+    keys[missing] = -1
+    return keys
+
+
+def _number_groups(keys, names, uniques):
+    """
+    Number the groups of combined keys in the order of a sorted groupby
+    
+    Parameters:
+        keys: Combined keys from _combine_codes
+        names: Names of the key columns
+        uniques: Values of the codes of every key column
+    
+    Returns:
+        tuple: (group of every row, -1 where a key is missing; sorted keys
+                of the groups; dictionary of the key columns of the groups)
+    """
+    groups, group_keys = pd.factorize(keys, sort=True)
+    if len(group_keys) and group_keys[0] == -1:
+        groups = groups - 1
+        group_keys = group_keys[1:]
+    
+    # Split the combined keys back into the codes of every column
+    columns = {}
+    remainder = group_keys
+    for name, column_uniques in reversed(list(zip(names, uniques))):
+        remainder, column_codes = np.divmod(remainder, len(column_uniques))
+        columns[name] = column_uniques.take(column_codes)
+    
+    return groups, group_keys, {name: columns[name] for name in names}
+
+
+def _group_sums(groups, values, n_groups, dtype=np.int64):
+    """Sum values per group number, skipping rows of group -1"""
+    if values.dtype == bool:
+        # Counting the selected rows is faster than weighting every row
+        sums = np.bincount(groups[values] + 1, minlength=n_groups + 1)[1:]
+    else:
+        sums = np.bincount(groups + 1, weights=values, minlength=n_groups + 1)[1:]
+    return sums.astype(dtype)
+
+
+def _innings_keys(deliveries_df, player_column, by):
+    """Key columns of the build_*_innings functions"""
+    keys = {
+        'match_id': deliveries_df['match_id'],
+        'inning': deliveries_df['inning'],
+        player_column: deliveries_df[player_column]
+    }
+    if by is not None:
+        keys = {'group': np.asarray(by), **keys}
+    return keys
+
+
+def build_batting_innings(deliveries_df, by=None):
+    """
+    Build one row per batter per innings from ball-by-ball data
+    
+    All batting statistics are aggregated from this table, which has more
+    than ten times fewer rows than the deliveries.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        by: Series aligned with deliveries_df that is constant within a
+            match, kept as a 'group' column (optional)
+    
+    Returns:
+        DataFrame with match_id, inning, batter, Runs, Balls, Fours,
+        Sixes, Dismissed (plus group)
+    """
+    # Number the (match, inning, batter) groups once and sum with bincount,
+    # which is several times faster than a multi-key groupby
+    keys = _innings_keys(deliveries_df, 'batter', by)
+    codes, uniques = zip(*(_key_codes(values) for values in keys.values()))
+    groups, group_keys, columns = _number_groups(_combine_codes(codes, uniques), list(keys), uniques)
+    n_groups = len(group_keys)
+    
+    # The dismissed player is not always the striker (e.g. run outs)
+    is_dismissal = ((deliveries_df['is_wicket'] == 1) & deliveries_df['player_dismissed'].notna()).to_numpy()
+    dismissed_codes = [column_codes[is_dismissal] for column_codes in codes]
+    dismissed_codes[-1] = _key_codes(deliveries_df['player_dismissed'][is_dismissal], uniques[-1])[0]
+    
+    # Wides are not counted as balls faced
+    runs = deliveries_df['batsman_runs'].to_numpy()
+    return pd.DataFrame({
+        **columns,
+        'Runs': _group_sums(groups, runs, n_groups, np.int32),
+        'Balls': _group_sums(groups, (deliveries_df['extras_type'] != 'wides').to_numpy(), n_groups),
+        'Fours': _group_sums(groups, runs == 4, n_groups),
+        'Sixes': _group_sums(groups, runs == 6, n_groups),
+        'Dismissed': np.isin(group_keys, _combine_codes(dismissed_codes, uniques))
+    })
+
+
+def build_bowling_innings(deliveries_df, by=None):
+    """
+    Build one row per bowler per innings from ball-by-ball data
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        by: Series aligned with deliveries_df that is constant within a
+            match, kept as a 'group' column (optional)
+    
+    Returns:
+        DataFrame with match_id, inning, bowler, Wickets (all wickets on
+        the bowler's deliveries), Credited_Wickets (without run outs and
+        retirements), Runs, Balls (plus group)
+    """
+    keys = _innings_keys(deliveries_df, 'bowler', by)
+    codes, uniques = zip(*(_key_codes(values) for values in keys.values()))
+    groups, group_keys, columns = _number_groups(_combine_codes(codes, uniques), list(keys), uniques)
+    n_groups = len(group_keys)
+    
+    # Wides and noballs are not legal deliveries
+    wicket = (deliveries_df['is_wicket'] == 1).to_numpy()
+    credited = wicket & ~deliveries_df['dismissal_kind'].isin(NON_BOWLER_DISMISSALS).to_numpy()
+    legal = ~deliveries_df['extras_type'].isin(['wides', 'noballs']).to_numpy()
+    return pd.DataFrame({
+        **columns,
+        'Wickets': _group_sums(groups, wicket, n_groups),
+        'Credited_Wickets': _group_sums(groups, credited, n_groups),
+        'Runs': _group_sums(groups, deliveries_df['total_runs'].to_numpy(), n_groups, np.int32),
+        'Balls': _group_sums(groups, legal, n_groups)
+    })
+
+
+# ==================== PLAYER STATISTICS FUNCTIONS ====================
+
+@memoize
+@uses_columns(matches=PERIOD_COLUMNS, deliveries=BATTING_COLUMNS)
+def get_batting_stats(deliveries_df, player_name=None, matches_df=None,
+                      seasons=None, start_date=None, end_date=None):
+    """
+    Calculate batting statistics for a player or all players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Specific player name (optional)
+        matches_df: DataFrame with match-level data, needed for season/date filters
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame with batting statistics
+    """
+    # Sum the per-season/per-date partial counts of the selected period
+    if _has_period(seasons, start_date, end_date):
+        batting_counts = get_period_counts(deliveries_df, matches_df, 'batting', seasons, start_date, end_date)
+        if player_name:
+            batting_counts = batting_counts[batting_counts.index == player_name]
+        return build_batting_table(batting_counts)
+    
+    # Filter for specific player if provided
+    if player_name:
+        return build_batting_table(aggregate_batting_innings(get_player_innings(deliveries_df, player_name)))
+    
+    return get_league_batting_table(deliveries_df).copy()
+
+
+@memoize
+@uses_columns(matches=PERIOD_COLUMNS, deliveries=BOWLING_COLUMNS)
+def get_bowling_stats(deliveries_df, player_name=None, matches_df=None,
+                      seasons=None, start_date=None, end_date=None):
+    """
+    Calculate bowling statistics for a player or all players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Specific player name (optional)
+        matches_df: DataFrame with match-level data, needed for season/date filters
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame with bowling statistics
+    """
+    # Sum the per-season/per-date partial counts of the selected period
+    if _has_period(seasons, start_date, end_date):
+        bowling_counts = get_period_counts(deliveries_df, matches_df, 'bowling', seasons, start_date, end_date)
+        if player_name:
+            bowling_counts = bowling_counts[bowling_counts.index == player_name]
+        return build_bowling_table(bowling_counts)
+    
+    # Filter for specific player if provided
+    if player_name:
+        return build_bowling_table(aggregate_bowling_innings(get_player_innings(deliveries_df, player_name, 'bowler')))
+    
+    return get_league_bowling_table(deliveries_df).copy()
+
+
+def compute_batting_counts(deliveries_df, by=None):
+    """
+    Calculate the raw batting counts of every batter
+    
+    The counts are plain sums, so counts computed on different matches can
+    be added together before the ratios are derived.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        by: Series aligned with deliveries_df to group by before the
+            batter, e.g. the season of each delivery (optional)
+    
+    Returns:
+        DataFrame indexed by batter (or by (by, batter)) with
+        Runs, Balls, Innings, Fours, Sixes
+    """
+    return aggregate_batting_innings(build_batting_innings(deliveries_df, by))
+
+
+def compute_bowling_counts(deliveries_df, by=None):
+    """
+    Calculate the raw bowling counts of every bowler
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        by: Series aligned with deliveries_df to group by before the
+            bowler, e.g. the season of each delivery (optional)
+    
+    Returns:
+        DataFrame indexed by bowler (or by (by, bowler)) with
+        Matches, Wickets, Runs, Balls
+    """
+    return aggregate_bowling_innings(build_bowling_innings(deliveries_df, by))
+
+
+def aggregate_batting_innings(batting_innings):
+    """
+    Sum batting innings into raw batting counts
+    
+    Every (match, inning) row is one innings, so a batter who bats again
+    in a super over is counted twice.
+    
+    Parameters:
+        batting_innings: DataFrame from build_batting_innings
+    
+    Returns:
+        DataFrame indexed by batter (or by (group, batter)) with
+        Runs, Balls, Innings, Fours, Sixes
+    """
+    return batting_innings.groupby(_group_keys('batter', batting_innings), observed=True).agg(
+        Runs=('Runs', 'sum'),
+        Balls=('Balls', 'sum'),
+        Innings=('inning', 'size'),
+        Fours=('Fours', 'sum'),
+        Sixes=('Sixes', 'sum')
+    )
+
+
+def aggregate_bowling_innings(bowling_innings):
+    """
+    Sum bowling innings into raw bowling counts
+    
+    Parameters:
+        bowling_innings: DataFrame from build_bowling_innings
+    
+    Returns:
+        DataFrame indexed by bowler (or by (group, bowler)) with
+        Matches, Wickets, Runs, Balls
+    """
+    return bowling_innings.groupby(_group_keys('bowler', bowling_innings), observed=True).agg(
+        Matches=('match_id', 'nunique'),
+        Wickets=('Wickets', 'sum'),
+        Runs=('Runs', 'sum'),
+        Balls=('Balls', 'sum')
+    )
+
+
+def build_batting_table(batting_counts):
+    """
+    Derive the batting statistics table from raw batting counts
+    
+    Parameters:
+        batting_counts: DataFrame from compute_batting_counts
+    
+    Returns:
+        DataFrame with batting statistics, sorted by total runs
+    """
+    runs = batting_counts['Runs']
+    
+    batting_stats = pd.DataFrame({
+        'Player': batting_counts.index,
+        'Innings': batting_counts['Innings'].values,
+        'Total_Runs': runs.values,
+        'Average': _ratio(runs, batting_counts['Innings']).round(2).values,
+        'Strike_Rate': (_ratio(runs, batting_counts['Balls']) * 100).round(2).values,
+        'Balls_Faced': batting_counts['Balls'].values,
+        'Fours': batting_counts['Fours'].values,
+        'Sixes': batting_counts['Sixes'].values
+    })
+    
+    # Sort by total runs
+    batting_stats = batting_stats.sort_values('Total_Runs', ascending=False)
+    
+    return batting_stats
+
+
+def build_bowling_table(bowling_counts):
+    """
+    Derive the bowling statistics table from raw bowling counts
+    
+    Only bowlers with at least one wicket are included.
+    
+    Parameters:
+        bowling_counts: DataFrame from compute_bowling_counts
+    
+    Returns:
+        DataFrame with bowling statistics, sorted by wickets
+    """
+    bowling_counts = bowling_counts[bowling_counts['Wickets'] > 0]
+    runs = bowling_counts['Runs']
+    overs = (bowling_counts['Balls'] / 6).round(1)
+    
+    bowling_stats = pd.DataFrame({
+        'Player': bowling_counts.index,
+        'Matches': bowling_counts['Matches'].values,
+        'Wickets': bowling_counts['Wickets'].values,
+        'Runs_Conceded': runs.values,
+        'Overs': overs.values,
+        'Economy': _ratio(runs, overs).round(2).values,
+        'Average': _ratio(runs, bowling_counts['Wickets']).round(2).values
+    })
+    
+    # Sort by wickets
+    bowling_stats = bowling_stats.sort_values('Wickets', ascending=False)
+    
+    return bowling_stats
+
+
+def merge_counts(counts_list):
+    """
+    Add up raw counts computed on separate sets of matches
+    
+    Works for the output of every compute_*_counts function. Innings and
+    match counts are only additive when no match is split between parts.
+    
+    Parameters:
+        counts_list: List of DataFrames or Series with raw counts
+    
+    Returns:
+        Combined counts, indexed like the inputs
+    """
+    # Empty parts would only change the dtype of the combined index
+    non_empty = [counts for counts in counts_list if len(counts)]
+    if not non_empty:
+        return counts_list[0]
+    
+    combined = pd.concat(non_empty)
+    return combined.groupby(level=0, observed=True).sum()
+
+
+def _group_keys(player_column, innings):
+    """Groupby keys of the aggregate_*_innings functions"""
+    return ['group', player_column] if 'group' in innings.columns else player_column
+
+
+def _ratio(numerator, denominator):
+    """Divide two Series, using 0 wherever the denominator is 0"""
+    return (numerator / denominator).replace([np.inf, -np.inf], 0).fillna(0)
+
+
+# ==================== SEASON FILTER FUNCTIONS ====================
+
+def filter_matches(matches_df, seasons=None, start_date=None, end_date=None):
+    """
+    Filter matches by season and date range
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame with the matches of the selected period
+    """
+    mask = np.ones(len(matches_df), dtype=bool)
+    
+    if seasons is not None:
+        if isinstance(seasons, (str, int)):
+            seasons = [seasons]
+        mask &= matches_df['season'].astype(str).isin([str(season) for season in seasons]).to_numpy()
+    
+    # Dates are ISO strings, so they compare correctly as text
+    dates = matches_df['date'].astype(str)
+    if start_date is not None:
+        mask &= (dates >= _iso_date(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (dates <= _iso_date(end_date)).to_numpy()
+    
+    return matches_df[mask]
+
+
+def build_period_partials(deliveries_df, matches_df, role):
+    """
+    Build batting or bowling counts per season and per match date
+    
+    A player plays at most one match per date, so the counts of any set of
+    dates (or seasons) can be added up with merge_counts. Each role only
+    reads the deliveries columns of its own innings table.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        matches_df: DataFrame with match-level data
+        role: 'batting' or 'bowling'
+    
+    Returns:
+        Dictionary of counts indexed by (season, player) and (date, player)
+    """
+    matches = matches_df.set_index('id')
+    dates = matches['date'].astype(str)
+    seasons = matches['season'].astype(str)
+    if role == 'batting':
+        innings, aggregate = get_batting_innings(deliveries_df), aggregate_batting_innings
+    else:
+        innings, aggregate = get_bowling_innings(deliveries_df), aggregate_bowling_innings
+    
+    return {
+        'by_date': aggregate(innings.assign(group=innings['match_id'].map(dates))),
+        'by_season': aggregate(innings.assign(group=innings['match_id'].map(seasons))),
+    }
+
+
+def get_period_counts(deliveries_df, matches_df, role, seasons=None, start_date=None, end_date=None):
+    """
+    Get batting or bowling counts for a season/date range from the partials
+    
+    Seasons that are fully inside the range use the per-season counts; only
+    the dates of partly covered seasons use the per-date counts.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        matches_df: DataFrame with match-level data
+        role: 'batting' or 'bowling'
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame of raw counts indexed by player
+    """
+    if matches_df is None:
+        raise ValueError("matches_df is required to filter by season or date")
+    
+    partials = get_derived(
+        deliveries_df, f'period_partials:{role}:{dataset_version(matches_df)}',
+        lambda df: build_period_partials(df, matches_df, role)
+    )
+    
+    # Seasons where every match date is selected are served from the season counts
+    selected = filter_matches(matches_df, seasons, start_date, end_date)
+    selected_dates = selected.groupby(selected['season'].astype(str))['date'].nunique()
+    all_dates = matches_df.groupby(matches_df['season'].astype(str))['date'].nunique()
+    full_seasons = selected_dates.index[selected_dates == all_dates.reindex(selected_dates.index)]
+    partial_dates = selected.loc[~selected['season'].astype(str).isin(full_seasons), 'date'].astype(str)
+    
+    by_season = partials['by_season']
+    by_date = partials['by_date']
+    parts = [
+        by_season[by_season.index.get_level_values(0).isin(full_seasons)],
+        by_date[by_date.index.get_level_values(0).isin(partial_dates)]
+    ]
+    
+    combined = pd.concat(parts)
+    return combined.groupby(level=1, observed=True).sum()
+
+
+def _has_period(seasons, start_date, end_date):
+    """Check whether a season or date filter was given"""
+    return seasons is not None or start_date is not None or end_date is not None
+
+
+def _iso_date(value):
+    """Convert a date, Timestamp or string to 'YYYY-MM-DD'"""
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+# ==================== LEAGUE TABLE FUNCTIONS ====================
+
+# League-wide tables are materialized once per dataset version (see
+# get_derived) and shared by every page; callers must not modify them
+
+@uses_columns(deliveries=BATTING_COLUMNS)
+def get_league_batting_table(deliveries_df):
+    """
+    Get the materialized batting table for all players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Shared DataFrame with batting statistics, sorted by total runs
+    """
+    return get_derived(
+        deliveries_df, 'batting_table',
+        lambda df: build_batting_table(aggregate_batting_innings(get_batting_innings(df)))
+    )
+
+
+@uses_columns(deliveries=BOWLING_COLUMNS)
+def get_league_bowling_table(deliveries_df):
+    """
+    Get the materialized bowling table for all players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Shared DataFrame with bowling statistics, sorted by wickets
+    """
+    return get_derived(
+        deliveries_df, 'bowling_table',
+        lambda df: build_bowling_table(aggregate_bowling_innings(get_bowling_innings(df)))
+    )
+
+
+@uses_columns(matches=TEAM_COLUMNS)
+def get_league_team_table(matches_df):
+    """
+    Get the materialized team table for all teams
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Shared DataFrame with team statistics, sorted by wins
+    """
+    return get_derived(
+        matches_df, 'team_table',
+        lambda df: build_team_table(_team_counts(get_team_season_cube(df)))
+    )
+
+
+@memoize
+@uses_columns(deliveries=BATTING_COLUMNS + BOWLING_COLUMNS)
+def get_player_comparison(deliveries_df, player_names):
+    """
+    Get batting and bowling statistics for a group of players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_names: List of player names
+    
+    Returns:
+        tuple: (batting_stats_df, bowling_stats_df) for the given players
+    """
+    batting_table = get_league_batting_table(deliveries_df)
+    bowling_table = get_league_bowling_table(deliveries_df)
+    
+    return (
+        batting_table[batting_table['Player'].isin(player_names)],
+        bowling_table[bowling_table['Player'].isin(player_names)]
+    )
+
+
+# Stats that can be ranked on the leaderboard. Rate stats need a minimum
+# qualifier (balls, innings, overs, wickets) to keep small samples out.
+LEADERBOARD_STATS = {
+    'runs': {'label': 'Most Runs', 'table': 'batting', 'column': 'Total_Runs', 'ascending': False},
+    'average': {'label': 'Best Batting Average', 'table': 'batting', 'column': 'Average', 'ascending': False,
+                'qualifier': 'Innings', 'minimum': 20},
+    'strike_rate': {'label': 'Best Strike Rate', 'table': 'batting', 'column': 'Strike_Rate', 'ascending': False,
+                    'qualifier': 'Balls_Faced', 'minimum': 250},
+    'fours': {'label': 'Most Fours', 'table': 'batting', 'column': 'Fours', 'ascending': False},
+    'sixes': {'label': 'Most Sixes', 'table': 'batting', 'column': 'Sixes', 'ascending': False},
+    'wickets': {'label': 'Most Wickets', 'table': 'bowling', 'column': 'Wickets', 'ascending': False},
+    'economy': {'label': 'Best Economy', 'table': 'bowling', 'column': 'Economy', 'ascending': True,
+                'qualifier': 'Overs', 'minimum': 50},
+    'bowling_average': {'label': 'Best Bowling Average', 'table': 'bowling', 'column': 'Average', 'ascending': True,
+                        'qualifier': 'Wickets', 'minimum': 20},
+}
+
+
+@memoize
+@uses_columns(deliveries=BATTING_COLUMNS + BOWLING_COLUMNS)
+def get_leaderboard(deliveries_df, stat, n=10, minimum=None):
+    """
+    Get the top N players for a stat without sorting the whole table
+    
+    Players with equal values are ordered by name, so the result does not
+    depend on the order of the underlying table.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        stat: Key of LEADERBOARD_STATS (e.g. 'runs', 'economy')
+        n: Number of players (default: 10)
+        minimum: Minimum value of the stat's qualifier column
+                 (default: the qualifier's standard minimum)
+    
+    Returns:
+        DataFrame with the top N rows of the batting or bowling table
+    """
+    config = LEADERBOARD_STATS[stat]
+    if config['table'] == 'batting':
+        table = get_league_batting_table(deliveries_df)
+    else:
+        table = get_league_bowling_table(deliveries_df)
+    
+    # Keep only players that meet the qualifier
+    eligible = np.arange(len(table))
+    if 'qualifier' in config:
+        if minimum is None:
+            minimum = config['minimum']
+        eligible = np.flatnonzero(table[config['qualifier']].to_numpy() >= minimum)
+    
+    values = table[config['column']].to_numpy(dtype=float)[eligible]
+    positions = top_n_positions(
+        values if config['ascending'] else -values,
+        table['Player'].to_numpy(dtype=object)[eligible],
+        n
+    )
+    
+    return table.iloc[eligible[positions]].copy()
+
+
+def top_n_positions(keys, tiebreak, n):
+    """
+    Get the positions of the N smallest keys using partial selection
+    
+    np.partition finds the cutoff value in linear time; only the rows at or
+    below the cutoff (including every tie at the cutoff) are then sorted.
+    
+    Parameters:
+        keys: Array of values to rank, smallest first
+        tiebreak: Array used to order equal keys
+        n: Number of positions to return
+    
+    Returns:
+        Array of at most n positions, in rank order
+    """
+    if n <= 0 or len(keys) == 0:
+        return np.array([], dtype=np.intp)
+    
+    if n < len(keys):
+        cutoff = np.partition(keys, n - 1)[n - 1]
+        candidates = np.flatnonzero(keys <= cutoff)
+    else:
+        candidates = np.arange(len(keys))
+    
+    order = np.lexsort((tiebreak[candidates], keys[candidates]))
+    return candidates[order][:n]
+
+
+@uses_columns(deliveries=BATTING_COLUMNS)
+def get_top_run_scorers(deliveries_df, n=10):
+    """
+    Get top N run scorers
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        n: Number of top scorers (default: 10)
+    
+    Returns:
+        DataFrame with top scorers
+    """
+    return get_leaderboard(deliveries_df, 'runs', n)
+
+
+@uses_columns(deliveries=BOWLING_COLUMNS)
+def get_top_wicket_takers(deliveries_df, n=10):
+    """
+    Get top N wicket takers
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        n: Number of top wicket takers (default: 10)
+    
+    Returns:
+        DataFrame with top wicket takers
+    """
+    return get_leaderboard(deliveries_df, 'wickets', n)
+
+
+# ==================== MILESTONE FUNCTIONS ====================
+
+@memoize
+@uses_columns(matches=PERIOD_COLUMNS, deliveries=BATTING_COLUMNS)
+def get_batting_milestones(deliveries_df, player_name=None, matches_df=None,
+                           seasons=None, start_date=None, end_date=None):
+    """
+    Get the highest score, fifties and hundreds of a player or all players
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Specific player name (optional)
+        matches_df: DataFrame with match-level data, needed for season/date filters
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame with Player, Highest_Score, Not_Out (of the highest
+        score), Fifties, Hundreds
+    """
+    if _has_period(seasons, start_date, end_date):
+        innings = _period_innings(get_batting_innings(deliveries_df), matches_df, seasons, start_date, end_date)
+        milestones = build_batting_milestones(innings, _score_order(innings))
+    else:
+        milestones = get_derived(
+            deliveries_df, 'batting_milestones',
+            lambda df: build_batting_milestones(get_batting_innings(df), _get_score_order(df))
+        )
+    
+    if player_name:
+        return milestones[milestones['Player'] == player_name]
+    return milestones.copy()
+
+
+@memoize
+@uses_columns(matches=PERIOD_COLUMNS, deliveries=BOWLING_COLUMNS)
+def get_bowling_milestones(deliveries_df, player_name=None, matches_df=None,
+                           seasons=None, start_date=None, end_date=None):
+    """
+    Get the best figures and wicket hauls of a player or all players
+    
+    Figures and hauls use the wickets credited to the bowler.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Specific player name (optional)
+        matches_df: DataFrame with match-level data, needed for season/date filters
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        DataFrame with Player, Best_Figures (e.g. '4/21'),
+        Three_Wickets, Four_Wickets, Five_Wickets (number of innings)
+    """
+    if _has_period(seasons, start_date, end_date):
+        innings = _period_innings(get_bowling_innings(deliveries_df), matches_df, seasons, start_date, end_date)
+        milestones = build_bowling_milestones(innings, _figures_order(innings))
+    else:
+        milestones = get_derived(
+            deliveries_df, 'bowling_milestones',
+            lambda df: build_bowling_milestones(get_bowling_innings(df), _get_figures_order(df))
+        )
+    
+    if player_name:
+        return milestones[milestones['Player'] == player_name]
+    return milestones.copy()
+
+
+def build_batting_milestones(batting_innings, order):
+    """
+    Build the batting milestones of every player
+    
+    Parameters:
+        batting_innings: DataFrame from build_batting_innings
+        order: Positions of the innings from the highest score down
+    
+    Returns:
+        DataFrame with batting milestones (see get_batting_milestones)
+    """
+    ranked = batting_innings.take(order)
+    runs = ranked['Runs']
+    
+    # The innings are ranked, so the first innings of each player is the best
+    indicators = pd.DataFrame({
+        'batter': ranked['batter'],
+        'runs': runs,
+        'not_out': ~ranked['Dismissed'],
+        'fifty': (runs >= 50) & (runs < 100),
+        'hundred': runs >= 100
+    })
+    milestones = indicators.groupby('batter', observed=True).agg(
+        Highest_Score=('runs', 'first'),
+        Not_Out=('not_out', 'first'),
+        Fifties=('fifty', 'sum'),
+        Hundreds=('hundred', 'sum')
+    )
+    
+    return milestones.reset_index().rename(columns={'batter': 'Player'})
+
+
+def build_bowling_milestones(bowling_innings, order):
+    """
+    Build the bowling milestones of every player
+    
+    Parameters:
+        bowling_innings: DataFrame from build_bowling_innings
+        order: Positions of the innings from the best figures down
+    
+    Returns:
+        DataFrame with bowling milestones (see get_bowling_milestones)
+    """
+    ranked = bowling_innings.take(order)
+    wickets = ranked['Credited_Wickets']
+    
+    indicators = pd.DataFrame({
+        'bowler': ranked['bowler'],
+        'figures': wickets.astype(str) + '/' + ranked['Runs'].astype(str),
+        'three': wickets == 3,
+        'four': wickets == 4,
+        'five': wickets >= 5
+    })
+    milestones = indicators.groupby('bowler', observed=True).agg(
+        Best_Figures=('figures', 'first'),
+        Three_Wickets=('three', 'sum'),
+        Four_Wickets=('four', 'sum'),
+        Five_Wickets=('five', 'sum')
+    )
+    
+    return milestones.reset_index().rename(columns={'bowler': 'Player'})
+
+
+@memoize
+@uses_columns(deliveries=BATTING_COLUMNS)
+def get_top_scores(deliveries_df, n=10):
+    """
+    Get the highest individual scores
+    
+    Served from the innings ranked once per dataset version, so only the
+    top n innings are read.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        n: Number of innings (default: 10)
+    
+    Returns:
+        DataFrame with Player, Runs, Balls, Fours, Sixes, Not_Out, Match_ID
+    """
+    innings = get_batting_innings(deliveries_df).take(_get_score_order(deliveries_df)[:n])
+    
+    return pd.DataFrame({
+        'Player': innings['batter'].values,
+        'Runs': innings['Runs'].values,
+        'Balls': innings['Balls'].values,
+        'Fours': innings['Fours'].values,
+        'Sixes': innings['Sixes'].values,
+        'Not_Out': ~innings['Dismissed'].values,
+        'Match_ID': innings['match_id'].values
+    })
+
+
+@memoize
+@uses_columns(deliveries=BOWLING_COLUMNS)
+def get_best_figures(deliveries_df, n=10):
+    """
+    Get the best bowling figures (most wickets, then fewest runs)
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        n: Number of innings (default: 10)
+    
+    Returns:
+        DataFrame with Player, Wickets, Runs, Overs, Match_ID
+    """
+    return _figures_rows(get_bowling_innings(deliveries_df).take(_get_figures_order(deliveries_df)[:n]))
+
+
+@memoize
+@uses_columns(deliveries=BOWLING_COLUMNS)
+def get_wicket_hauls(deliveries_df, minimum=5):
+    """
+    Get every innings in which a bowler took at least `minimum` wickets
+    
+    The innings are ranked by figures, so the hauls are a prefix of the
+    ranking found with a binary search.
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        minimum: Minimum number of credited wickets (default: 5)
+    
+    Returns:
+        DataFrame with Player, Wickets, Runs, Overs, Match_ID, best first
+    """
+    innings = get_bowling_innings(deliveries_df)
+    order = _get_figures_order(deliveries_df)
+    
+    ranked_wickets = innings['Credited_Wickets'].to_numpy()[order]
+    count = np.searchsorted(-ranked_wickets, -minimum, side='right')
+    
+    return _figures_rows(innings.take(order[:count]))
+
+
+def _figures_rows(innings):
+    """Bowling innings as rows of a figures table"""
+    return pd.DataFrame({
+        'Player': innings['bowler'].values,
+        'Wickets': innings['Credited_Wickets'].values,
+        'Runs': innings['Runs'].values,
+        'Overs': (innings['Balls'] / 6).round(1).values,
+        'Match_ID': innings['match_id'].values
+    })
+
+
+def _get_score_order(deliveries_df):
+    """Ranking of the batting innings of a dataset, built on first use"""
+    return get_derived(deliveries_df, 'score_order', lambda df: _score_order(get_batting_innings(df)))
+
+
+def _get_figures_order(deliveries_df):
+    """Ranking of the bowling innings of a dataset, built on first use"""
+    return get_derived(deliveries_df, 'figures_order', lambda df: _figures_order(get_bowling_innings(df)))
+
+
+def _score_order(batting_innings):
+    """Positions of batting innings from the highest score down (fewest balls first on ties)"""
+    return np.lexsort((batting_innings['Balls'].to_numpy(), -batting_innings['Runs'].to_numpy()))
+
+
+def _figures_order(bowling_innings):
+    """Positions of bowling innings from the most wickets down (fewest runs first on ties)"""
+    return np.lexsort((bowling_innings['Runs'].to_numpy(), -bowling_innings['Credited_Wickets'].to_numpy()))
 
-# ==================== DATA LOADING FUNCTIONS ====================
 
-def load_data():
+def _period_innings(innings, matches_df, seasons, start_date, end_date):
+    """Innings of the matches in a season/date range"""
+    if matches_df is None:
+        raise ValueError("matches_df is required to filter by season or date")
+    selected = filter_matches(matches_df, seasons, start_date, end_date)
+    return innings[innings['match_id'].isin(selected['id'])]
+
+
+# ==================== PHASE STATISTICS FUNCTIONS ====================
+
+# Phases of an innings; overs are numbered from 0
+PHASES = ['Powerplay', 'Middle', 'Death']
+_PHASE_OF_OVER = np.array([0] * 6 + [1] * 9 + [2] * 5, dtype=np.int8)
+
+
+def phase_codes(overs):
     """
-    Load matches and deliveries data from CSV files
+    Get the phase code of each over (0 powerplay, 1 middle, 2 death)
+    
+    Parameters:
+        overs: Array or Series of over numbers (0-19)
     
     Returns:
-        tuple: (matches_df, deliveries_df)
+        Array of phase codes, indexes into PHASES
     """
-    try:
-        matches = pd.read_csv('data/matches.csv')
-        deliveries = pd.read_csv('data/deliveries.csv')
-        return matches, deliveries
-    except FileNotFoundError:
-        return None, None
-
+    return _PHASE_OF_OVER[np.clip(np.asarray(overs), 0, len(_PHASE_OF_OVER) - 1)]
 
-# ==================== PLAYER STATISTICS FUNCTIONS ====================
 
-def get_batting_stats(deliveries_df, player_name=None):
+@uses_columns(deliveries=PHASE_COLUMNS)
+def get_phase_cube(deliveries_df):
     """
-    Calculate batting statistics for a player or all players
+    Get the phase counts of every player and team, building them on first use
     
     Parameters:
         deliveries_df: DataFrame with ball-by-ball data
-        player_name: Specific player name (optional)
     
     Returns:
-        DataFrame with batting statistics
+        Dictionary with:
+            batters, bowlers, teams: Index of names; a name's position is its code
+            batting, bowling, team_batting, team_bowling: Dictionaries
+                mapping a count (Runs, Balls, ...) to an array [code, phase]
     """
-    # Filter for specific player if provided
-    if player_name:
-        player_data = deliveries_df[deliveries_df['batter'] == player_name]
-    else:
-        player_data = deliveries_df
+    return get_derived(deliveries_df, 'phase_cube', build_phase_cube)
+
+
+def build_phase_cube(deliveries_df):
+    """
+    Build the phase counts of every player and team in one pass
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
     
-    # Calculate total runs scored by each batsman
-    total_runs = player_data.groupby('batter')['batsman_runs'].sum()
+    Returns:
+        Dictionary with the name codes and count arrays (see get_phase_cube)
+    """
+    phase = phase_codes(deliveries_df['over'])
+    batsman_runs = deliveries_df['batsman_runs'].to_numpy().astype(np.int64)
+    total_runs = deliveries_df['total_runs'].to_numpy().astype(np.int64)
+    wide = (deliveries_df['extras_type'] == 'wides').to_numpy()
+    legal = ~deliveries_df['extras_type'].isin(['wides', 'noballs']).to_numpy()
+    wicket = (deliveries_df['is_wicket'] == 1).to_numpy()
+    boundary = (batsman_runs == 4) | (batsman_runs == 6)
+    
+    batter_codes, batters = _name_codes(deliveries_df['batter'])
+    bowler_codes, bowlers = _name_codes(deliveries_df['bowler'])
+    (batting_team, bowling_team), teams = _shared_codes(
+        [deliveries_df['batting_team'], deliveries_df['bowling_team']]
+    )
+    
+    # Dismissals count for the dismissed player, who is not always the striker
+    wicket_rows = np.flatnonzero(wicket & deliveries_df['player_dismissed'].notna().to_numpy())
+    dismissed = _codes_in(deliveries_df['player_dismissed'].iloc[wicket_rows], batters)
+    
+    team_counts = {
+        'Runs': total_runs,
+        'Balls': legal,
+        'Wickets': wicket,
+        'Boundaries': boundary,
+        'Dots': legal & (total_runs == 0)
+    }
     
-    # Calculate number of balls faced (excluding wides which are not counted as balls faced)
-    balls_faced = player_data[player_data['extras_type'] != 'wides'].groupby('batter').size()
+    batting = _phase_counts(batter_codes, len(batters), phase, {
+        'Runs': batsman_runs,
+        'Balls': ~wide,
+        'Boundaries': boundary,
+        'Dots': ~wide & (batsman_runs == 0)
+    })
+    batting['Dismissals'] = _phase_counts(dismissed, len(batters), phase[wicket_rows], {'Dismissals': None})['Dismissals']
     
-    # Calculate strike rate (runs per 100 balls)
-    strike_rate = (total_runs / balls_faced * 100).round(2)
+    return {
+        'batters': batters,
+        'bowlers': bowlers,
+        'teams': teams,
+        'batting': batting,
+        'bowling': _phase_counts(bowler_codes, len(bowlers), phase, team_counts),
+        'team_batting': _phase_counts(batting_team, len(teams), phase, team_counts),
+        'team_bowling': _phase_counts(bowling_team, len(teams), phase, team_counts),
+    }
+
+
+@memoize
+@uses_columns(deliveries=PHASE_COLUMNS)
+def get_player_phase_stats(deliveries_df, player_name, role='batting'):
+    """
+    Get the statistics of a player in each phase of the innings
     
-    # Calculate number of innings
-    innings = player_data.groupby('batter')['match_id'].nunique()
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        player_name: Name of the player
+        role: 'batting' or 'bowling' (default: 'batting')
     
-    # Calculate average (total runs / innings) - handle division by zero
-    average = (total_runs / innings).round(2)
-    average = average.replace([np.inf, -np.inf], 0)
+    Returns:
+        DataFrame with one row per phase: Phase, Runs, Balls, Dismissals or
+        Wickets, Boundaries, Dots, Strike_Rate or Economy, Dot_Percentage
+    """
+    cube = get_phase_cube(deliveries_df)
+    names = cube['batters'] if role == 'batting' else cube['bowlers']
+    return _phase_table(cube[role], names.get_indexer([player_name])[0], role)
+
+
+@memoize
+@uses_columns(deliveries=PHASE_COLUMNS)
+def get_team_phase_stats(deliveries_df, team_name, role='batting'):
+    """
+    Get the statistics of a team in each phase of the innings
     
-    # Count boundaries (4s and 6s)
-    fours = player_data[player_data['batsman_runs'] == 4].groupby('batter').size()
-    sixes = player_data[player_data['batsman_runs'] == 6].groupby('batter').size()
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        team_name: Name of the team
+        role: 'batting' or 'bowling' (default: 'batting')
     
-    # Combine all stats into a DataFrame
-    batting_stats = pd.DataFrame({
-        'Player': total_runs.index,
-        'Innings': innings.reindex(total_runs.index, fill_value=0).values,
-        'Total_Runs': total_runs.values,
-        'Average': average.reindex(total_runs.index, fill_value=0).values,
-        'Strike_Rate': strike_rate.reindex(total_runs.index, fill_value=0).values,
-        'Balls_Faced': balls_faced.reindex(total_runs.index, fill_value=0).values,
-        'Fours': fours.reindex(total_runs.index, fill_value=0).values,
-        'Sixes': sixes.reindex(total_runs.index, fill_value=0).values
-    })
+    Returns:
+        DataFrame with one row per phase: Phase, Runs, Balls, Wickets,
+        Boundaries, Dots, Run_Rate or Economy, Dot_Percentage
+    """
+    cube = get_phase_cube(deliveries_df)
+    return _phase_table(cube[f'team_{role}'], cube['teams'].get_indexer([team_name])[0], f'team_{role}')
+
+
+def _phase_counts(codes, n_codes, phase, counts):
+    """Sum each count per (code, phase) with bincount; None counts rows"""
+    valid = codes >= 0
+    cell = codes[valid] * len(PHASES) + phase[valid]
+    size = n_codes * len(PHASES)
     
-    # Sort by total runs
-    batting_stats = batting_stats.sort_values('Total_Runs', ascending=False)
+    return {
+        name: np.bincount(
+            cell, weights=None if values is None else np.asarray(values)[valid], minlength=size
+        ).astype(np.int64).reshape(n_codes, len(PHASES))
+        for name, values in counts.items()
+    }
+
+
+def _phase_table(counts, code, role):
+    """Phase statistics table of one row code of a phase cube"""
+    # Columns are collected first, inserting them one by one is much slower
+    columns = {'Phase': PHASES}
+    for name, values in counts.items():
+        columns[name] = pd.Series(values[code] if code >= 0 else np.zeros(len(PHASES), dtype=values.dtype))
+    
+    balls = columns['Balls']
+    if role == 'batting':
+        columns['Strike_Rate'] = (_ratio(columns['Runs'], balls) * 100).round(2)
+    elif role == 'team_batting':
+        columns['Run_Rate'] = (_ratio(columns['Runs'], balls) * 6).round(2)
+    else:
+        columns['Economy'] = (_ratio(columns['Runs'], balls) * 6).round(2)
+    columns['Dot_Percentage'] = (_ratio(columns['Dots'], balls) * 100).round(2)
     
-    return batting_stats
+    return pd.DataFrame(columns)
+
+
+def _codes_in(series, labels):
+    """Positions of the names of a column in labels (-1 if missing)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if series.cat.categories.equals(labels):
+            return series.cat.codes.to_numpy().astype(np.int64)
+        # Look up each category once instead of every row
+        category_codes = np.append(labels.get_indexer(series.cat.categories), -1)
+        return category_codes[series.cat.codes.to_numpy()]
+    return labels.get_indexer(series.astype(object))
 
 
-def get_bowling_stats(deliveries_df, player_name=None):
+def _name_codes(series):
+    """Integer codes and labels of a name column (-1 for missing names)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), pd.Index(series.cat.categories)
+    codes, labels = pd.factorize(series, sort=True)
+    return codes, pd.Index(labels)
+
+
+# ==================== MATCHUP FUNCTIONS ====================
+
+@uses_columns(deliveries=MATCHUP_COLUMNS)
+def get_matchup_matrix(deliveries_df):
     """
-    Calculate bowling statistics for a player or all players
+    Get the batter x bowler matchup matrix, building it on first use
     
     Parameters:
         deliveries_df: DataFrame with ball-by-ball data
-        player_name: Specific player name (optional)
     
     Returns:
-        DataFrame with bowling statistics
+        Shared dictionary from build_matchup_matrix
     """
-    # Filter for specific player if provided
-    if player_name:
-        player_data = deliveries_df[deliveries_df['bowler'] == player_name]
-    else:
-        player_data = deliveries_df
+    return get_derived(deliveries_df, 'matchup_matrix', build_matchup_matrix)
+
+
+def build_matchup_matrix(deliveries_df):
+    """
+    Build a sparse batter x bowler matrix of runs, balls and dismissals
     
-    # Calculate total wickets taken
-    wickets = player_data[player_data['is_wicket'] == 1].groupby('bowler').size()
+    Only pairs that faced each other are stored, in compressed sparse row
+    (CSR) form over integer player codes: the bowlers faced by the batter
+    with code i are indices[indptr[i]:indptr[i + 1]]. A second copy sorted
+    by bowler gives the batters faced by each bowler.
     
-    # Calculate total runs conceded
-    runs_conceded = player_data.groupby('bowler')['total_runs'].sum()
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+    
+    Returns:
+        Dictionary with:
+            batters, bowlers: Index of names; a name's position is its code
+            indptr, indices: CSR structure of the rows (batters)
+            runs, balls, dismissals: Values of the stored pairs, in CSR order
+            bowler_indptr, bowler_indices: CSR structure of the columns (bowlers)
+            bowler_order: Position of each column entry in the value arrays
+    """
+    batter_codes, batters = _name_codes(deliveries_df['batter'])
+    bowler_codes, bowlers = _name_codes(deliveries_df['bowler'])
+    valid = (batter_codes >= 0) & (bowler_codes >= 0)
     
-    # Calculate balls bowled (excluding wides and noballs as they don't count as legal deliveries)
-    # Wides and noballs are in extras_type column
-    legal_deliveries = player_data[~player_data['extras_type'].isin(['wides', 'noballs'])]
-    balls_bowled = legal_deliveries.groupby('bowler').size()
+    # Dismissals credited to the bowler are always of the striker
+    wicket = (deliveries_df['is_wicket'] == 1) & ~deliveries_df['dismissal_kind'].isin(NON_BOWLER_DISMISSALS)
+    ball = deliveries_df['extras_type'] != 'wides'
     
-    # Calculate overs bowled
-    overs_bowled = (balls_bowled / 6).round(1)
+    pair = batter_codes[valid] * len(bowlers) + bowler_codes[valid]
+    pairs, inverse = np.unique(pair, return_inverse=True)
+    rows = pairs // len(bowlers)
+    columns = pairs % len(bowlers)
     
-    # Calculate economy rate (runs per over) - handle division by zero
-    economy = (runs_conceded / overs_bowled).round(2)
-    economy = economy.replace([np.inf, -np.inf], 0)
+    def pair_sum(values):
+        return np.bincount(inverse, weights=np.asarray(values)[valid], minlength=len(pairs)).astype(np.int32)
     
-    # Calculate bowling average (runs per wicket) - handle division by zero
-    bowling_avg = (runs_conceded / wickets).round(2)
-    bowling_avg = bowling_avg.replace([np.inf, -np.inf], 0)
+    # Stable sort by bowler keeps the batters of each column in order
+    bowler_order = np.argsort(columns, kind='stable')
     
-    # Calculate number of matches
-    matches = player_data.groupby('bowler')['match_id'].nunique()
+    return {
+        'batters': batters,
+        'bowlers': bowlers,
+        'indptr': np.searchsorted(rows, np.arange(len(batters) + 1)),
+        'indices': columns.astype(np.int32),
+        'runs': pair_sum(deliveries_df['batsman_runs']),
+        'balls': pair_sum(ball),
+        'dismissals': pair_sum(wicket),
+        'bowler_indptr': np.searchsorted(columns[bowler_order], np.arange(len(bowlers) + 1)),
+        'bowler_indices': rows[bowler_order].astype(np.int32),
+        'bowler_order': bowler_order,
+    }
+
+
+@memoize
+@uses_columns(deliveries=MATCHUP_COLUMNS)
+def get_matchup(deliveries_df, batter, bowler):
+    """
+    Get the record of a batter against a bowler
     
-    # Combine all stats
-    bowling_stats = pd.DataFrame({
-        'Player': wickets.index,
-        'Matches': matches.reindex(wickets.index, fill_value=0).values,
-        'Wickets': wickets.values,
-        'Runs_Conceded': runs_conceded.reindex(wickets.index, fill_value=0).values,
-        'Overs': overs_bowled.reindex(wickets.index, fill_value=0).values,
-        'Economy': economy.reindex(wickets.index, fill_value=0).values,
-        'Average': bowling_avg.reindex(wickets.index, fill_value=0).values
-    })
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        batter: Name of the batter
+        bowler: Name of the bowler
     
-    # Sort by wickets
-    bowling_stats = bowling_stats.sort_values('Wickets', ascending=False)
+    Returns:
+        Dictionary with runs, balls, dismissals, strike_rate, average
+    """
+    matrix = get_matchup_matrix(deliveries_df)
+    batter_code = matrix['batters'].get_indexer([batter])[0]
+    bowler_code = matrix['bowlers'].get_indexer([bowler])[0]
+    
+    runs = balls = dismissals = 0
+    if batter_code >= 0 and bowler_code >= 0:
+        # Bowler codes are sorted within a row
+        start, end = matrix['indptr'][batter_code], matrix['indptr'][batter_code + 1]
+        position = start + np.searchsorted(matrix['indices'][start:end], bowler_code)
+        if position < end and matrix['indices'][position] == bowler_code:
+            runs = int(matrix['runs'][position])
+            balls = int(matrix['balls'][position])
+            dismissals = int(matrix['dismissals'][position])
     
-    return bowling_stats
+    return {
+        'runs': runs,
+        'balls': balls,
+        'dismissals': dismissals,
+        'strike_rate': round(runs / balls * 100, 2) if balls else 0.0,
+        'average': round(runs / dismissals, 2) if dismissals else 0.0
+    }
 
 
-def get_top_run_scorers(deliveries_df, n=10):
+@memoize
+@uses_columns(deliveries=MATCHUP_COLUMNS)
+def get_batter_matchups(deliveries_df, batter, min_balls=0):
     """
-    Get top N run scorers
+    Get the record of a batter against every bowler faced
     
     Parameters:
         deliveries_df: DataFrame with ball-by-ball data
-        n: Number of top scorers (default: 10)
+        batter: Name of the batter
+        min_balls: Minimum number of balls faced (default: 0)
     
     Returns:
-        DataFrame with top scorers
+        DataFrame with Bowler, Runs, Balls, Dismissals, Strike_Rate, Average,
+        sorted by balls faced
     """
-    batting_stats = get_batting_stats(deliveries_df)
-    return batting_stats.head(n)
+    matrix = get_matchup_matrix(deliveries_df)
+    code = matrix['batters'].get_indexer([batter])[0]
+    
+    positions = np.arange(0)
+    if code >= 0:
+        positions = np.arange(matrix['indptr'][code], matrix['indptr'][code + 1])
+    
+    return _matchup_table(matrix, positions, 'Bowler', matrix['bowlers'][matrix['indices'][positions]], min_balls)
 
 
-def get_top_wicket_takers(deliveries_df, n=10):
+@memoize
+@uses_columns(deliveries=MATCHUP_COLUMNS)
+def get_bowler_matchups(deliveries_df, bowler, min_balls=0):
     """
-    Get top N wicket takers
+    Get the record of a bowler against every batter faced
     
     Parameters:
         deliveries_df: DataFrame with ball-by-ball data
-        n: Number of top wicket takers (default: 10)
+        bowler: Name of the bowler
+        min_balls: Minimum number of balls bowled to the batter (default: 0)
     
     Returns:
-        DataFrame with top wicket takers
+        DataFrame with Batter, Runs, Balls, Dismissals, Strike_Rate, Average,
+        sorted by balls bowled
     """
-    bowling_stats = get_bowling_stats(deliveries_df)
-    return bowling_stats.head(n)
+    matrix = get_matchup_matrix(deliveries_df)
+    code = matrix['bowlers'].get_indexer([bowler])[0]
+    
+    entries = np.arange(0)
+    if code >= 0:
+        entries = np.arange(matrix['bowler_indptr'][code], matrix['bowler_indptr'][code + 1])
+    positions = matrix['bowler_order'][entries]
+    
+    return _matchup_table(matrix, positions, 'Batter', matrix['batters'][matrix['bowler_indices'][entries]], min_balls)
+
+
+def _matchup_table(matrix, positions, opponent_column, opponents, min_balls):
+    """Table of the matchup values at the given positions"""
+    runs = pd.Series(matrix['runs'][positions])
+    balls = pd.Series(matrix['balls'][positions])
+    dismissals = pd.Series(matrix['dismissals'][positions])
+    
+    matchups = pd.DataFrame({
+        opponent_column: opponents,
+        'Runs': runs,
+        'Balls': balls,
+        'Dismissals': dismissals,
+        'Strike_Rate': (_ratio(runs, balls) * 100).round(2),
+        'Average': _ratio(runs, dismissals).round(2)
+    })
+    matchups = matchups[matchups['Balls'] >= min_balls]
+    
+    return matchups.sort_values(['Balls', 'Runs'], ascending=False, kind='stable').reset_index(drop=True)
 
 
 # ==================== TEAM STATISTICS FUNCTIONS ====================
 
-def get_team_stats(matches_df):
+@memoize
+@uses_columns(matches=TEAM_COLUMNS)
+def get_team_stats(matches_df, seasons=None, start_date=None, end_date=None):
     """
     Calculate statistics for all teams
     
     Parameters:
         matches_df: DataFrame with match-level data
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
     
     Returns:
         DataFrame with team statistics
     """
-    # Count total matches played by each team
-    team1_matches = matches_df['team1'].value_counts()
-    team2_matches = matches_df['team2'].value_counts()
-    total_matches = team1_matches.add(team2_matches, fill_value=0)
+    if start_date is not None or end_date is not None:
+        period_matches = filter_matches(matches_df, seasons, start_date, end_date)
+        return build_team_table(compute_team_counts(period_matches))
+    
+    if seasons is not None:
+        cube = get_team_season_cube(matches_df)
+        return build_team_table(_team_counts(cube, _season_codes(cube, seasons)))
+    
+    return get_league_team_table(matches_df).copy()
+
+
+def compute_team_counts(matches_df):
+    """
+    Calculate the raw match and win counts of every team
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        DataFrame indexed by team with Matches_Played, Wins
+    """
+    return _team_counts(build_team_season_cube(matches_df))
+
+
+@uses_columns(matches=TEAM_COLUMNS)
+def get_team_season_cube(matches_df):
+    """
+    Get the matches and wins of every team in every season
+    
+    Built once per dataset version and shared by all callers.
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Dictionary with:
+            teams: Index of team names; a team's position is its code
+            seasons: Index of seasons; a season's position is its code
+            matches: Array [team, season] of matches played
+            wins: Array [team, season] of matches won
+    """
+    return get_derived(matches_df, 'team_seasons', build_team_season_cube)
+
+
+def build_team_season_cube(matches_df):
+    """
+    Build the team-season cube (see get_team_season_cube)
+    
+    Every match is counted twice, once for team1 and once for team2, in a
+    long table of (team, season, won) rows that is summed in one pass.
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Dictionary with the team and season codes and the count arrays
+    """
+    (code1, code2), teams = _shared_codes([matches_df['team1'], matches_df['team2']])
+    winner = _codes_in(matches_df['winner'], teams)
+    season_codes, seasons = pd.factorize(matches_df['season'].astype(object), sort=True)
     
-    # Count wins for each team
-    wins = matches_df['winner'].value_counts()
+    # Long table: one row per team per match
+    team = np.concatenate([code1, code2])
+    season = np.concatenate([season_codes, season_codes])
+    won = np.concatenate([winner == code1, winner == code2])
     
-    # Calculate win percentage
-    win_percentage = (wins / total_matches * 100).round(2)
+    valid = (team >= 0) & (season >= 0)
+    cell = team[valid] * len(seasons) + season[valid]
+    shape = (len(teams), len(seasons))
+    size = shape[0] * shape[1]
+    
+    return {
+        'teams': teams,
+        'seasons': pd.Index(seasons),
+        'matches': np.bincount(cell, minlength=size).reshape(shape),
+        'wins': np.bincount(cell[won[valid]], minlength=size).reshape(shape),
+    }
+
+
+def _team_counts(cube, season_codes=None):
+    """Matches_Played and Wins of every team in the cube, over the given seasons"""
+    matches = cube['matches']
+    wins = cube['wins']
+    if season_codes is not None:
+        matches = matches[:, season_codes]
+        wins = wins[:, season_codes]
+    
+    team_counts = pd.DataFrame({
+        'Matches_Played': matches.sum(axis=1).astype(np.int64),
+        'Wins': wins.sum(axis=1).astype(np.int64)
+    }, index=cube['teams'])
+    
+    return team_counts[team_counts['Matches_Played'] > 0]
+
+
+def build_team_table(team_counts):
+    """
+    Derive the team statistics table from raw team counts
+    
+    Parameters:
+        team_counts: DataFrame from compute_team_counts
+    
+    Returns:
+        DataFrame with team statistics, sorted by wins
+    """
+    total_matches = team_counts['Matches_Played']
+    wins = team_counts['Wins']
     
     # Combine stats
     team_stats = pd.DataFrame({
-        'Team': total_matches.index,
+        'Team': team_counts.index,
         'Matches_Played': total_matches.values,
-        'Wins': wins.reindex(total_matches.index, fill_value=0).values,
-        'Win_Percentage': win_percentage.reindex(total_matches.index, fill_value=0).values
+        'Wins': wins.values,
+        'Win_Percentage': (_ratio(wins, total_matches) * 100).round(2).values
     })
     
     # Sort by wins
@@ -207,6 +2288,8 @@ def get_team_stats(matches_df):
     return team_stats
 
 
+@memoize
+@uses_columns(matches=TEAM_COLUMNS)
 def get_team_performance_by_season(matches_df, team_name):
     """
     Get season-wise performance for a specific team
@@ -218,43 +2301,60 @@ def get_team_performance_by_season(matches_df, team_name):
     Returns:
         DataFrame with season-wise stats
     """
-    # Filter matches involving the team
-    team_matches = matches_df[(matches_df['team1'] == team_name) | (matches_df['team2'] == team_name)]
+    cube = get_team_season_cube(matches_df)
+    code = cube['teams'].get_indexer([team_name])[0]
+    
+    if code < 0:
+        matches = wins = np.zeros(len(cube['seasons']), dtype=np.int64)
+    else:
+        matches, wins = cube['matches'][code], cube['wins'][code]
+    played = matches > 0
     
-    # Group by season
-    season_stats = team_matches.groupby('season').agg({
-        'id': 'count',  # Total matches
-        'winner': lambda x: (x == team_name).sum()  # Wins
-    }).reset_index()
+    # Keep the season dtype of the matches frame
+    seasons = pd.Series(cube['seasons'][played]).astype(matches_df['season'].dtype)
     
-    season_stats.columns = ['Season', 'Matches', 'Wins']
+    season_stats = pd.DataFrame({
+        'Season': seasons,
+        'Matches': matches[played],
+        'Wins': wins[played]
+    })
     season_stats['Win_Rate'] = (season_stats['Wins'] / season_stats['Matches'] * 100).round(2)
     
     return season_stats
 
 
-def get_head_to_head(matches_df, team1, team2):
+@memoize
+@uses_columns(matches=TEAM_COLUMNS)
+def get_head_to_head(matches_df, team1, team2, seasons=None):
     """
     Get head-to-head record between two teams
     
+    The record is looked up in the head-to-head matrix, which is built once
+    per dataset version.
+    
     Parameters:
         matches_df: DataFrame with match-level data
         team1: First team name
         team2: Second team name
+        seasons: Season or list of seasons to include (optional)
     
     Returns:
         Dictionary with head-to-head stats
     """
-    # Filter matches between these two teams
-    h2h_matches = matches_df[
-        ((matches_df['team1'] == team1) & (matches_df['team2'] == team2)) |
-        ((matches_df['team1'] == team2) & (matches_df['team2'] == team1))
-    ]
-    
-    # Count wins
-    team1_wins = h2h_matches[h2h_matches['winner'] == team1].shape[0]
-    team2_wins = h2h_matches[h2h_matches['winner'] == team2].shape[0]
-    total_matches = h2h_matches.shape[0]
+    h2h = get_head_to_head_matrix(matches_df)
+    season_codes = _season_codes(h2h, seasons)
+    
+    team1_wins = team2_wins = total_matches = 0
+    if team1 in h2h['team_codes'] and team2 in h2h['team_codes']:
+        code1, code2 = h2h['team_codes'][team1], h2h['team_codes'][team2]
+        if season_codes is None:
+            team1_wins = int(h2h['total_wins'][code1, code2])
+            team2_wins = int(h2h['total_wins'][code2, code1])
+            total_matches = int(h2h['total_matches'][code1, code2])
+        else:
+            team1_wins = int(h2h['wins'][season_codes, code1, code2].sum())
+            team2_wins = int(h2h['wins'][season_codes, code2, code1].sum())
+            total_matches = int(h2h['matches'][season_codes, code1, code2].sum())
     
     return {
         'total_matches': total_matches,
@@ -264,8 +2364,120 @@ def get_head_to_head(matches_df, team1, team2):
     }
 
 
+@uses_columns(matches=TEAM_COLUMNS)
+def get_head_to_head_matrix(matches_df):
+    """
+    Get the head-to-head results of every pair of teams, per season
+    
+    Built once per dataset version and shared by all callers.
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Dictionary with:
+            teams: Index of team names; a team's position is its code
+            team_codes: Dictionary mapping team name to code
+            seasons: Index of seasons; a season's position is its code
+            matches: Array [season, team, opponent] of matches played
+            wins: Array [season, team, opponent] of matches team won
+            total_matches, total_wins: The same summed over all seasons
+    """
+    return get_derived(matches_df, 'head_to_head_matrix', build_head_to_head_matrix)
+
+
+def build_head_to_head_matrix(matches_df):
+    """
+    Build the head-to-head matrix (see get_head_to_head_matrix)
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Dictionary with the team and season codes and the count arrays
+    """
+    (code1, code2), teams = _shared_codes([matches_df['team1'], matches_df['team2']])
+    winner = _codes_in(matches_df['winner'], teams)
+    season_codes, seasons = pd.factorize(matches_df['season'].astype(object), sort=True)
+    
+    n_teams = len(teams)
+    shape = (len(seasons), n_teams, n_teams)
+    played = (code1 >= 0) & (code2 >= 0) & (season_codes >= 0)
+    
+    # Flat position of each match in the [season, team, opponent] cube
+    forward = (season_codes * n_teams + code1) * n_teams + code2
+    backward = (season_codes * n_teams + code2) * n_teams + code1
+    team1_won = played & (winner == code1)
+    team2_won = played & (winner == code2)
+    
+    size = int(np.prod(shape))
+    matches = (np.bincount(forward[played], minlength=size)
+               + np.bincount(backward[played], minlength=size)).reshape(shape)
+    wins = (np.bincount(forward[team1_won], minlength=size)
+            + np.bincount(backward[team2_won], minlength=size)).reshape(shape)
+    
+    return {
+        'teams': teams,
+        'team_codes': {team: code for code, team in enumerate(teams)},
+        'seasons': pd.Index(seasons),
+        'matches': matches.astype(np.int32),
+        'wins': wins.astype(np.int32),
+        'total_matches': matches.sum(axis=0).astype(np.int32),
+        'total_wins': wins.sum(axis=0).astype(np.int32),
+    }
+
+
+@memoize
+@uses_columns(matches=TEAM_COLUMNS)
+def get_head_to_head_table(matches_df, seasons=None):
+    """
+    Get the head-to-head record of every pair of teams that met
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+        seasons: Season or list of seasons to include (optional)
+    
+    Returns:
+        DataFrame with Team, Opponent, Matches, Wins, Losses, No_Result,
+        Win_Percentage (one row per ordered pair of teams)
+    """
+    h2h = get_head_to_head_matrix(matches_df)
+    season_codes = _season_codes(h2h, seasons)
+    
+    if season_codes is None:
+        matches, wins = h2h['total_matches'], h2h['total_wins']
+    else:
+        matches = h2h['matches'][season_codes].sum(axis=0)
+        wins = h2h['wins'][season_codes].sum(axis=0)
+    
+    team, opponent = np.nonzero(matches)
+    team_wins = wins[team, opponent]
+    team_losses = wins[opponent, team]
+    
+    return pd.DataFrame({
+        'Team': h2h['teams'][team],
+        'Opponent': h2h['teams'][opponent],
+        'Matches': matches[team, opponent],
+        'Wins': team_wins,
+        'Losses': team_losses,
+        'No_Result': matches[team, opponent] - team_wins - team_losses,
+        'Win_Percentage': (team_wins / matches[team, opponent] * 100).round(2)
+    })
+
+
+def _season_codes(table, seasons):
+    """Codes of the given seasons in a season-coded table, None for all"""
+    if seasons is None:
+        return None
+    if isinstance(seasons, (str, int)):
+        seasons = [seasons]
+    codes = table['seasons'].get_indexer([str(season) for season in seasons])
+    return codes[codes >= 0]
+
+
 # ==================== MATCH STATISTICS FUNCTIONS ====================
 
+@uses_columns(matches=['season'])
 def get_matches_by_season(matches_df):
     """
     Get number of matches played in each season
@@ -276,44 +2488,133 @@ def get_matches_by_season(matches_df):
     Returns:
         Series with season-wise match counts
     """
-    return matches_df['season'].value_counts().sort_index()
+    season_matches = get_derived(
+        matches_df, 'season_matches',
+        lambda df: df['season'].value_counts().sort_index()
+    )
+    return season_matches.copy()
 
 
-def get_venue_stats(matches_df):
+@memoize
+@uses_columns(matches=['venue'] + PERIOD_COLUMNS)
+def get_venue_stats(matches_df, seasons=None, start_date=None, end_date=None):
     """
     Get statistics for each venue
     
     Parameters:
         matches_df: DataFrame with match-level data
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
     
     Returns:
         DataFrame with venue statistics
     """
-    venue_stats = matches_df.groupby('venue').agg({
-        'id': 'count',  # Total matches
-    }).reset_index()
+    if _has_period(seasons, start_date, end_date):
+        matches_df = filter_matches(matches_df, seasons, start_date, end_date)
+        return build_venue_table(compute_venue_counts(matches_df))
+    
+    venue_table = get_derived(
+        matches_df, 'venue_table',
+        lambda df: build_venue_table(compute_venue_counts(df))
+    )
+    return venue_table.copy()
+
+
+def compute_venue_counts(matches_df):
+    """
+    Calculate the number of matches played at each venue
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Series indexed by venue with match counts
+    """
+    venue_counts = matches_df.groupby('venue', observed=True)['id'].count()
+    venue_counts.name = 'Matches_Played'
+    return venue_counts
+
+
+def build_venue_table(venue_counts):
+    """
+    Derive the venue statistics table from venue match counts
+    
+    Parameters:
+        venue_counts: Series from compute_venue_counts
     
-    venue_stats.columns = ['Venue', 'Matches_Played']
+    Returns:
+        DataFrame with venue statistics, sorted by matches played
+    """
+    venue_stats = pd.DataFrame({
+        'Venue': venue_counts.index,
+        'Matches_Played': venue_counts.values
+    })
     venue_stats = venue_stats.sort_values('Matches_Played', ascending=False)
     
     return venue_stats
 
 
-def get_toss_impact(matches_df):
+@memoize
+@uses_columns(matches=['toss_winner', 'winner', 'season', 'date'])
+def get_toss_impact(matches_df, seasons=None, start_date=None, end_date=None):
     """
     Analyze impact of toss on match results
     
     Parameters:
         matches_df: DataFrame with match-level data
+        seasons: Season or list of seasons to include (optional)
+        start_date: First match date to include, e.g. '2023-03-31' (optional)
+        end_date: Last match date to include (optional)
+    
+    Returns:
+        Dictionary with toss impact statistics
+    """
+    if _has_period(seasons, start_date, end_date):
+        matches_df = filter_matches(matches_df, seasons, start_date, end_date)
+        return build_toss_impact(compute_toss_counts(matches_df))
+    
+    toss_impact = get_derived(
+        matches_df, 'toss_impact',
+        lambda df: build_toss_impact(compute_toss_counts(df))
+    )
+    return dict(toss_impact)
+
+
+def compute_toss_counts(matches_df):
+    """
+    Calculate the raw toss counts
+    
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        Series with total_matches and toss_winner_won_match
+    """
+    # Count matches where toss winner also won the match (compared on codes)
+    (toss_winner, winner), _ = _shared_codes([matches_df['toss_winner'], matches_df['winner']])
+    toss_won_match = (toss_winner >= 0) & (toss_winner == winner)
+    
+    return pd.Series({
+        'total_matches': matches_df.shape[0],
+        'toss_winner_won_match': int(toss_won_match.sum())
+    })
+
+
+def build_toss_impact(toss_counts):
+    """
+    Derive the toss impact statistics from raw toss counts
+    
+    Parameters:
+        toss_counts: Series from compute_toss_counts
     
     Returns:
         Dictionary with toss impact statistics
     """
-    # Count matches where toss winner also won the match
-    toss_and_match_win = matches_df[matches_df['toss_winner'] == matches_df['winner']].shape[0]
-    total_matches = matches_df.shape[0]
+    total_matches = int(toss_counts['total_matches'])
+    toss_and_match_win = int(toss_counts['toss_winner_won_match'])
     
-    win_percentage = round((toss_and_match_win / total_matches * 100), 2)    
+    win_percentage = round((toss_and_match_win / total_matches * 100), 2) if total_matches else 0
     return {
         'total_matches': total_matches,
         'toss_winner_won_match': toss_and_match_win,
@@ -321,10 +2622,24 @@ def get_toss_impact(matches_df):
     }
 
 
+@uses_columns(matches=['date', 'season', 'venue', 'winner'])
 def get_season_winners(matches_df):
     """
     Get the winner of each IPL season
     
+    Parameters:
+        matches_df: DataFrame with match-level data
+    
+    Returns:
+        DataFrame with season winners
+    """
+    return get_derived(matches_df, 'season_winners', build_season_winners).copy()
+
+
+def build_season_winners(matches_df):
+    """
+    Build the season winners table (see get_season_winners)
+    
     Parameters:
         matches_df: DataFrame with match-level data
     
@@ -333,7 +2648,7 @@ def get_season_winners(matches_df):
     """
     # Filter for final matches (usually the last match of each season)
     # Group by season and get the last match (final)
-    season_finals = matches_df.sort_values('date').groupby('season').last()
+    season_finals = matches_df.sort_values('date').groupby('season', observed=True).last()
     
     season_winners = pd.DataFrame({
         'Season': season_finals.index,
@@ -346,6 +2661,7 @@ def get_season_winners(matches_df):
 
 # ==================== UTILITY FUNCTIONS ====================
 
+@uses_columns(deliveries=['batter', 'bowler'])
 def get_all_players(deliveries_df):
     """
     Get list of all unique players
@@ -356,13 +2672,23 @@ def get_all_players(deliveries_df):
     Returns:
         Sorted list of player names
     """
-    batters = set(deliveries_df['batter'].unique())
-    bowlers = set(deliveries_df['bowler'].unique())
-    all_players = sorted(list(batters.union(bowlers)))
+    return list(get_derived(deliveries_df, 'players', build_player_list))
+
+
+def build_player_list(deliveries_df):
+    """
+    Build the sorted list of players who batted or bowled (see get_all_players)
+    
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
     
-    return all_players
+    Returns:
+        Sorted list of player names
+    """
+    return _used_names([deliveries_df['batter'], deliveries_df['bowler']]).tolist()
 
 
+@uses_columns(matches=['team1', 'team2'])
 def get_all_teams(matches_df):
     """
     Get list of all unique teams
@@ -373,13 +2699,10 @@ def get_all_teams(matches_df):
     Returns:
         Sorted list of team names
     """
-    teams1 = set(matches_df['team1'].unique())
-    teams2 = set(matches_df['team2'].unique())
-    all_teams = sorted(list(teams1.union(teams2)))
-    
-    return all_teams
+    return _used_names([matches_df['team1'], matches_df['team2']]).tolist()
 
 
+@uses_columns(matches=['season'])
 def get_seasons(matches_df):
     """
     Get list of all seasons
@@ -0,0 +1,404 @@
+"""
+JSON API Server
+This module serves the statistics shown by the Streamlit pages as a
+read-only JSON API, for services that only need the numbers
+
+Usage:
+    python api_server.py                        # http://127.0.0.1:8000
+    python api_server.py --port 9000 --cache-size 4096
+
+    curl 'http://127.0.0.1:8000/players/batting?player=V+Kohli&season=2016'
+
+Responses are cached in a bounded LRU cache keyed by the endpoint, its query
+parameters and the dataset versions, so repeated requests skip the analysis
+functions. The versions are digests of the CSV contents, so a changed CSV
+file gets new keys and never serves stale numbers.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import analysis as an
+import data_cache
+from lru_cache import LRUCache
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 1024
+
+# Requests with a larger header block are rejected
+MAX_HEADER_BYTES = 16 * 1024
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE = LRUCache(DEFAULT_CACHE_SIZE)
+
+
+class BadRequest(Exception):
+    """A missing or invalid query parameter (answered with HTTP 400)"""
+
+
+# ==================== PARAMETER FUNCTIONS ====================
+
+def _param(query, name, required=False, choices=None, convert=str, default=None):
+    """
+    Get a single query parameter
+
+    Parameters:
+        query: Dictionary from parse_qs
+        name: Parameter name
+        required: Raise BadRequest if the parameter is missing
+        choices: Allowed values (optional)
+        convert: Function applied to the value (e.g. int)
+        default: Value of a missing parameter
+
+    Returns:
+        The converted value, or default
+    """
+    values = query.get(name)
+    if not values:
+        if required:
+            raise BadRequest(f"missing parameter '{name}'")
+        return default
+
+    value = values[-1]
+    if choices is not None and value not in choices:
+        raise BadRequest(f"'{name}' must be one of: {', '.join(choices)}")
+    try:
+        return convert(value)
+    except ValueError:
+        raise BadRequest(f"invalid value for '{name}': {value}")
+
+
+def _period(query):
+    """Season and date filters shared by many endpoints"""
+    seasons = [season for value in query.get('season', []) for season in value.split(',') if season]
+    return {
+        'seasons': seasons or None,
+        'start_date': _param(query, 'start_date', convert=an._iso_date),
+        'end_date': _param(query, 'end_date', convert=an._iso_date),
+    }
+
+
+# ==================== ENDPOINT FUNCTIONS ====================
+
+# Every endpoint takes (query, matches_df, deliveries_df) and returns a
+# DataFrame, Series or JSON-serializable value
+
+def _players(query, matches_df, deliveries_df):
+    return an.get_all_players(deliveries_df)
+
+
+def _teams(query, matches_df, deliveries_df):
+    return an.get_all_teams(matches_df)
+
+
+def _seasons(query, matches_df, deliveries_df):
+    return [str(season) for season in an.get_seasons(matches_df)]
+
+
+def _batting(query, matches_df, deliveries_df):
+    return an.get_batting_stats(deliveries_df, _param(query, 'player'), matches_df, **_period(query))
+
+
+def _bowling(query, matches_df, deliveries_df):
+    return an.get_bowling_stats(deliveries_df, _param(query, 'player'), matches_df, **_period(query))
+
+
+def _milestones(query, matches_df, deliveries_df):
+    role = _param(query, 'role', choices=['batting', 'bowling'], default='batting')
+    milestones = an.get_batting_milestones if role == 'batting' else an.get_bowling_milestones
+    return milestones(deliveries_df, _param(query, 'player'), matches_df, **_period(query))
+
+
+def _player_phases(query, matches_df, deliveries_df):
+    role = _param(query, 'role', choices=['batting', 'bowling'], default='batting')
+    return an.get_player_phase_stats(deliveries_df, _param(query, 'player', required=True), role)
+
+
+def _team_stats(query, matches_df, deliveries_df):
+    return an.get_team_stats(matches_df, **_period(query))
+
+
+def _team_seasons(query, matches_df, deliveries_df):
+    return an.get_team_performance_by_season(matches_df, _param(query, 'team', required=True))
+
+
+def _team_phases(query, matches_df, deliveries_df):
+    role = _param(query, 'role', choices=['batting', 'bowling'], default='batting')
+    return an.get_team_phase_stats(deliveries_df, _param(query, 'team', required=True), role)
+
+
+def _head_to_head(query, matches_df, deliveries_df):
+    seasons = _period(query)['seasons']
+    team1 = _param(query, 'team1')
+    team2 = _param(query, 'team2')
+    if team1 and team2:
+        return an.get_head_to_head(matches_df, team1, team2, seasons)
+    if team1 or team2:
+        raise BadRequest("give both 'team1' and 'team2', or neither for all pairs")
+    return an.get_head_to_head_table(matches_df, seasons)
+
+
+def _venues(query, matches_df, deliveries_df):
+    return an.get_venue_stats(matches_df, **_period(query))
+
+
+def _toss(query, matches_df, deliveries_df):
+    return an.get_toss_impact(matches_df, **_period(query))
+
+
+def _season_matches(query, matches_df, deliveries_df):
+    return an.get_matches_by_season(matches_df)
+
+
+def _season_winners(query, matches_df, deliveries_df):
+    return an.get_season_winners(matches_df)
+
+
+def _leaderboard(query, matches_df, deliveries_df):
+    stat = _param(query, 'stat', required=True, choices=list(an.LEADERBOARD_STATS))
+    n = _param(query, 'n', convert=int, default=10)
+    minimum = _param(query, 'minimum', convert=float)
+    return an.get_leaderboard(deliveries_df, stat, n, minimum)
+
+
+def _matchups(query, matches_df, deliveries_df):
+    batter = _param(query, 'batter')
+    bowler = _param(query, 'bowler')
+    min_balls = _param(query, 'min_balls', convert=int, default=0)
+    if batter and bowler:
+        return an.get_matchup(deliveries_df, batter, bowler)
+    if batter:
+        return an.get_batter_matchups(deliveries_df, batter, min_balls)
+    if bowler:
+        return an.get_bowler_matchups(deliveries_df, bowler, min_balls)
+    raise BadRequest("give 'batter', 'bowler' or both")
+
+
+ENDPOINTS = {
+    '/players': _players,
+    '/players/batting': _batting,
+    '/players/bowling': _bowling,
+    '/players/milestones': _milestones,
+    '/players/phases': _player_phases,
+    '/teams': _teams,
+    '/teams/stats': _team_stats,
+    '/teams/seasons': _team_seasons,
+    '/teams/phases': _team_phases,
+    '/head-to-head': _head_to_head,
+    '/venues': _venues,
+    '/toss': _toss,
+    '/seasons': _seasons,
+    '/seasons/matches': _season_matches,
+    '/seasons/winners': _season_winners,
+    '/leaderboard': _leaderboard,
+    '/matchups': _matchups,
+}
+
+
+# ==================== RESPONSE FUNCTIONS ====================
+
+def render(target):
+    """
+    Answer a GET request
+
+    Runs in a worker thread, since the analysis functions block.
+
+    Parameters:
+        target: Request target, e.g. '/teams/stats?season=2016'
+
+    Returns:
+        tuple: (HTTP status, JSON body as bytes, 'HIT', 'MISS' or None)
+    """
+    url = urlsplit(target)
+    path = url.path.rstrip('/') or '/'
+    query = parse_qs(url.query)
+
+    if path == '/health':
+        return 200, _to_json({
+            'status': 'ok',
+            'endpoints': sorted(ENDPOINTS),
+            'cache': RESPONSE_CACHE.stats(),
+            'memoized': an.get_memo_stats(),
+        }), None
+    if path not in ENDPOINTS:
+        return 404, _error(f"unknown endpoint {path}"), None
+
+    matches_df, deliveries_df = an.get_dataset()
+    if matches_df is None or deliveries_df is None:
+        return 503, _error("data files not found"), None
+
+    key = (path, tuple(sorted((name, tuple(values)) for name, values in query.items())),
+           an.dataset_version(matches_df), an.dataset_version(deliveries_df))
+    body = RESPONSE_CACHE.get(key)
+    if body is not None:
+        return 200, body, 'HIT'
+
+    try:
+        body = _to_json(ENDPOINTS[path](query, matches_df, deliveries_df))
+    except BadRequest as e:
+        return 400, _error(str(e)), None
+    except Exception:
+        logger.exception("Error answering %s", target)
+        return 500, _error("internal error"), None
+
+    RESPONSE_CACHE.put(key, body)
+    return 200, body, 'MISS'
+
+
+def _to_json(value):
+    """Encode a result as JSON bytes (tables become lists of row objects)"""
+    if isinstance(value, pd.DataFrame):
+        return value.to_json(orient='records').encode()
+    if isinstance(value, pd.Series):
+        return value.to_json(orient='index').encode()
+    return json.dumps(value, default=data_cache.json_default).encode()
+
+
+def _error(message):
+    """JSON body of an error response"""
+    return json.dumps({'error': message}).encode()
+
+
+# ==================== HTTP FUNCTIONS ====================
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    431: 'Request Header Fields Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+async def handle_connection(reader, writer):
+    """
+    Serve the HTTP/1.1 requests of one connection
+
+    Connections are kept open between requests unless the client asks to
+    close them or speaks HTTP/1.0.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.LimitOverrunError:
+                writer.write(_http_response(431, _error("header too large"), None, False))
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ')
+            except ValueError:
+                writer.write(_http_response(400, _error("malformed request line"), None, False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                if value:
+                    headers[name.strip().lower()] = value.strip()
+
+            # GET requests have no body, but skip one if a client sends it
+            try:
+                length = int(headers.get('content-length', 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_http_response(400, _error("invalid Content-Length"), None, False))
+                break
+            if length:
+                await reader.readexactly(length)
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+            if method != 'GET':
+                status, body, cache_state = 405, _error("only GET is supported"), None
+            else:
+                status, body, cache_state = await loop.run_in_executor(None, render, target)
+
+            writer.write(_http_response(status, body, cache_state, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def _http_response(status, body, cache_state, keep_alive):
+    """Encode an HTTP/1.1 response with a JSON body"""
+    headers = [
+        f'HTTP/1.1 {status} {REASONS[status]}',
+        'Content-Type: application/json',
+        f'Content-Length: {len(body)}',
+        f'Connection: {"keep-alive" if keep_alive else "close"}',
+    ]
+    if cache_state:
+        headers.append(f'X-Cache: {cache_state}')
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Start listening for requests
+
+    Parameters:
+        host: Interface to listen on
+        port: TCP port (0 picks a free port)
+
+    Returns:
+        asyncio.Server; its sockets give the actual port
+    """
+    return await asyncio.start_server(handle_connection, host, port, limit=MAX_HEADER_BYTES)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Serve requests until the process is stopped"""
+    server = await start_server(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+# ==================== MAIN ====================
+
+def main():
+    """Parse the command line, load the data and serve the API"""
+    parser = argparse.ArgumentParser(description="Serve the IPL statistics as a JSON API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Responses kept in the cache (default: {DEFAULT_CACHE_SIZE})")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    RESPONSE_CACHE.maxsize = args.cache_size
+
+    # Load the data before the first request instead of during it
+    matches_df, deliveries_df = an.get_dataset()
+    if matches_df is None or deliveries_df is None:
+        print("❌ ERROR: data/matches.csv or data/deliveries.csv not found!")
+        print("   Run validate_data.py for help with the dataset")
+        raise SystemExit(1)
+
+    print(f"🏏 Serving {len(matches_df):,} matches on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
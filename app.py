@@ -4,9 +4,12 @@ Main Application - Home Page
 """
 
 import streamlit as st
-import pandas as pd
-import analysis as an
-import visualizations as viz
+
+from page_shell import lazy_import
+
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
 
 # Page Configuration
 st.set_page_config(
@@ -15,18 +18,19 @@ st.set_page_config(
     layout="wide"
 )
 
-# Load Data (cached)
-@st.cache_data
-def load_data():
-    """Load and cache cricket data"""
-    matches, deliveries = an.load_data()
-    return matches, deliveries
+# ==================== HOME PAGE ====================
+
+st.title("🏏 IPL Cricket Statistics Analyzer")
+st.markdown("### Comprehensive Analysis of Indian Premier League (2008-2024)")
+
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
 
-# Load the data
-matches_df, deliveries_df = load_data()
+# Load the columns used on this page (shared across all pages)
+matches_df = an.get_matches(an.get_matches_by_season, an.get_season_winners)
 
 # Check if data is loaded
-if matches_df is None or deliveries_df is None:
+if matches_df is None:
     st.error("⚠️ **Error: Data files not found!**")
     st.info("""
     Please download the IPL dataset and place the CSV files in the `data/` folder:
@@ -37,11 +41,6 @@ if matches_df is None or deliveries_df is None:
     """)
     st.stop()
 
-# ==================== HOME PAGE ====================
-
-st.title("🏏 IPL Cricket Statistics Analyzer")
-st.markdown("### Comprehensive Analysis of Indian Premier League (2008-2024)")
-
 st.markdown("---")
 
 # Quick Statistics
@@ -54,15 +53,15 @@ with col1:
     st.metric("Total Matches", f"{total_matches:,}")
 
 with col2:
-    total_seasons = len(an.get_seasons(matches_df))
+    total_seasons = len(an.get_names('seasons'))
     st.metric("Seasons", total_seasons)
 
 with col3:
-    total_teams = len(an.get_all_teams(matches_df))
+    total_teams = len(an.get_names('teams'))
     st.metric("Teams", total_teams)
 
 with col4:
-    total_players = len(an.get_all_players(deliveries_df))
+    total_players = len(an.get_names('players'))
     st.metric("Players", f"{total_players:,}")
 
 st.markdown("---")
@@ -70,6 +69,9 @@ st.markdown("---")
 # Overview Charts
 st.markdown("## 📈 Overview")
 
+# Ball-by-ball data is only needed for the top 10 lists
+deliveries_df = an.get_deliveries(an.get_top_run_scorers, an.get_top_wicket_takers)
+
 col1, col2 = st.columns(2)
 
 with col1:
@@ -103,4 +105,6 @@ st.markdown("""
     <p>IPL Cricket Statistics Analyzer | Built with Streamlit, Pandas, and NumPy</p>
     <p>Use the sidebar to navigate to different analysis pages →</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+profiling.show_debug_panel("Home")
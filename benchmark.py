@@ -0,0 +1,820 @@
+"""
+Performance Benchmark Script
+Run this script to time the analysis functions on the real dataset and on
+synthetic datasets scaled up from it
+
+Usage:
+    python benchmark.py                                # real data + synthetic 1x and 10x
+    python benchmark.py suite --scales 1 10 100 --output results.json
+    python benchmark.py suite --compare results.json   # flag regressions
+    python benchmark.py legacy                         # original vs. single-pass groupbys
+    python benchmark.py parallel                       # worker scaling of parallel.py
+    python benchmark.py api --concurrency 1 8 64       # requests/second of api_server.py
+    python benchmark.py startup --runs 5               # launch to first paint of every page
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+import analysis as an
+import parallel
+import schema
+
+
+# Match ids of the synthetic copies are shifted by this much per copy
+SYNTHETIC_ID_OFFSET = 10_000_000
+
+# A case more than this much slower than the baseline is a regression
+REGRESSION_THRESHOLD = 0.10
+
+DEFAULT_SCALES = [1, 10]
+
+DEFAULT_CONCURRENCY = [1, 4, 16, 64]
+
+# Server launches timed per page by the startup benchmark
+DEFAULT_STARTUP_RUNS = 3
+
+
+# ==================== REFERENCE IMPLEMENTATIONS ====================
+
+def legacy_batting_stats(deliveries_df):
+    """Original batting statistics: one groupby per column"""
+    total_runs = deliveries_df.groupby('batter', observed=True)['batsman_runs'].sum()
+    balls_faced = deliveries_df[deliveries_df['extras_type'] != 'wides'].groupby('batter', observed=True).size()
+    innings = deliveries_df.groupby('batter', observed=True)['match_id'].nunique()
+    fours = deliveries_df[deliveries_df['batsman_runs'] == 4].groupby('batter', observed=True).size()
+    sixes = deliveries_df[deliveries_df['batsman_runs'] == 6].groupby('batter', observed=True).size()
+
+    batting_stats = pd.DataFrame({
+        'Player': total_runs.index,
+        'Innings': innings.reindex(total_runs.index, fill_value=0).values,
+        'Total_Runs': total_runs.values,
+        'Average': (total_runs / innings).round(2).reindex(total_runs.index, fill_value=0).values,
+        'Strike_Rate': (total_runs / balls_faced * 100).round(2).reindex(total_runs.index, fill_value=0).values,
+        'Balls_Faced': balls_faced.reindex(total_runs.index, fill_value=0).values,
+        'Fours': fours.reindex(total_runs.index, fill_value=0).values,
+        'Sixes': sixes.reindex(total_runs.index, fill_value=0).values
+    })
+    return batting_stats.sort_values('Total_Runs', ascending=False)
+
+
+def legacy_bowling_stats(deliveries_df):
+    """Original bowling statistics: one groupby per column"""
+    wickets = deliveries_df[deliveries_df['is_wicket'] == 1].groupby('bowler', observed=True).size()
+    runs_conceded = deliveries_df.groupby('bowler', observed=True)['total_runs'].sum()
+    legal_deliveries = deliveries_df[~deliveries_df['extras_type'].isin(['wides', 'noballs'])]
+    overs_bowled = (legal_deliveries.groupby('bowler', observed=True).size() / 6).round(1)
+    matches = deliveries_df.groupby('bowler', observed=True)['match_id'].nunique()
+
+    bowling_stats = pd.DataFrame({
+        'Player': wickets.index,
+        'Matches': matches.reindex(wickets.index, fill_value=0).values,
+        'Wickets': wickets.values,
+        'Runs_Conceded': runs_conceded.reindex(wickets.index, fill_value=0).values,
+        'Overs': overs_bowled.reindex(wickets.index, fill_value=0).values,
+        'Economy': (runs_conceded / overs_bowled).round(2).reindex(wickets.index, fill_value=0).values,
+        'Average': (runs_conceded / wickets).round(2).reindex(wickets.index, fill_value=0).values
+    })
+    return bowling_stats.sort_values('Wickets', ascending=False)
+
+
+# ==================== SYNTHETIC DATA FUNCTIONS ====================
+
+def generate_synthetic_data(matches_df, scale=1, players=800, seed=0):
+    """
+    Generate a random ball-by-ball dataset from the real match list
+
+    The matches are copied `scale` times with new ids, and every match gets
+    two innings of 120 random deliveries with the columns of deliveries.csv.
+
+    Parameters:
+        matches_df: DataFrame with match-level data
+        scale: Number of copies of the match list (default: 1)
+        players: Number of distinct player names (default: 800)
+        seed: Random seed (default: 0)
+
+    Returns:
+        tuple: (matches_df, deliveries_df)
+    """
+    rng = np.random.default_rng(seed)
+
+    matches = pd.concat([
+        matches_df.assign(id=matches_df['id'] + copy * SYNTHETIC_ID_OFFSET)
+        for copy in range(scale)
+    ], ignore_index=True)
+
+    balls_per_innings = 120
+    n_innings = len(matches) * 2
+    n_rows = n_innings * balls_per_innings
+    ball_in_innings = np.tile(np.arange(balls_per_innings), n_innings)
+    over = ball_in_innings // 6
+
+    # Each innings gets a random block of 11 batters and 6 bowlers;
+    # a new batter comes in every two overs
+    batting_start = np.repeat(rng.integers(0, players - 11, n_innings), balls_per_innings)
+    bowling_start = np.repeat(rng.integers(0, players - 6, n_innings), balls_per_innings)
+    batter = batting_start + (ball_in_innings // 12) % 11
+    non_striker = batting_start + (ball_in_innings // 12 + 1) % 11
+
+    # Extras codes: -1 none, 0 wides, 1 legbyes, 2 byes, 3 noballs
+    extras_type = rng.choice(5, n_rows, p=[0.90, 0.04, 0.03, 0.01, 0.02]) - 1
+    batsman_runs = rng.choice([0, 1, 2, 3, 4, 6], n_rows, p=[0.38, 0.35, 0.07, 0.01, 0.12, 0.07])
+    batsman_runs[(extras_type >= 0) & (extras_type <= 2)] = 0
+    extra_runs = (extras_type >= 0).astype(np.int8)
+    is_wicket = rng.random(n_rows) < 0.05
+
+    # Innings 1 is batted by team1, innings 2 by team2
+    team_codes, team_names = pd.factorize(
+        np.stack([matches['team1'].astype(str), matches['team2'].astype(str)], axis=1).ravel()
+    )
+    batting_team = np.repeat(team_codes, balls_per_innings)
+    bowling_team = np.repeat(team_codes.reshape(-1, 2)[:, ::-1].ravel(), balls_per_innings)
+
+    names = pd.Index([f'Synthetic Player {i:04d}' for i in range(players)])
+    deliveries = pd.DataFrame({
+        'match_id': np.repeat(matches['id'].to_numpy(), 2 * balls_per_innings),
+        'inning': np.tile(np.repeat([1, 2], balls_per_innings), len(matches)),
+        'batting_team': pd.Categorical.from_codes(batting_team, team_names),
+        'bowling_team': pd.Categorical.from_codes(bowling_team, team_names),
+        'over': over,
+        'ball': ball_in_innings % 6 + 1,
+        'batter': pd.Categorical.from_codes(batter, names),
+        'bowler': pd.Categorical.from_codes(bowling_start + over % 6, names),
+        'non_striker': pd.Categorical.from_codes(non_striker, names),
+        'batsman_runs': batsman_runs,
+        'extra_runs': extra_runs,
+        'total_runs': batsman_runs + extra_runs,
+        'extras_type': pd.Categorical.from_codes(extras_type, ['wides', 'legbyes', 'byes', 'noballs']),
+        'is_wicket': is_wicket,
+        'player_dismissed': pd.Categorical.from_codes(np.where(is_wicket, batter, -1), names),
+        'dismissal_kind': pd.Categorical.from_codes(
+            np.where(is_wicket, rng.choice(4, n_rows), -1), ['caught', 'bowled', 'lbw', 'run out']
+        ),
+        'fielder': pd.Categorical.from_codes(np.full(n_rows, -1), names),
+    })
+    numeric = {column: dtype for column, dtype in schema.DELIVERIES_SCHEMA.items() if dtype != 'category'}
+
+    return matches, deliveries.astype(numeric)
+
+
+# ==================== TIMING FUNCTIONS ====================
+
+def time_function(func, *args, repeat=5):
+    """
+    Time a function call, keeping the best of several runs
+
+    Parameters:
+        func: Function to time
+        *args: Arguments passed to the function
+        repeat: Number of runs (default: 5)
+
+    Returns:
+        Best wall time in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(func, repeat=3):
+    """
+    Time a benchmark case cold and warm, and record its peak memory
+
+    Cold runs start without derived tables (indexes, league tables), warm
+    runs reuse the ones built by the previous call. Neither reuses memoized
+    results, which would only time a cache lookup.
+
+    Parameters:
+        func: Function without arguments
+        repeat: Number of timed runs per mode (default: 3)
+
+    Returns:
+        Dictionary with cold_ms, warm_ms and peak_mb
+    """
+    def cold():
+        an.clear_derived()
+        func()
+
+    def warm():
+        an.clear_memoized()
+        func()
+
+    cold_time = time_function(cold, repeat=repeat)
+    warm_time = time_function(warm, repeat=repeat)
+
+    # Separate run for memory, tracemalloc slows down the code it traces
+    an.clear_derived()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'cold_ms': round(cold_time * 1000, 3),
+        'warm_ms': round(warm_time * 1000, 3),
+        'peak_mb': round(peak / 1024 ** 2, 3),
+    }
+
+
+def benchmark_cases(matches_df, deliveries_df):
+    """
+    Build the benchmark cases for one dataset
+
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+
+    Returns:
+        Dictionary mapping case name to a function without arguments
+    """
+    player = an.get_top_run_scorers(deliveries_df, 1)['Player'].iloc[0]
+    teams = an.get_all_teams(matches_df)
+    season = an.get_seasons(matches_df)[-1]
+
+    return {
+        'get_batting_stats': lambda: an.get_batting_stats(deliveries_df),
+        'get_batting_stats(player)': lambda: an.get_batting_stats(deliveries_df, player),
+        'get_batting_stats(season)': lambda: an.get_batting_stats(deliveries_df, matches_df=matches_df, seasons=season),
+        'get_bowling_stats': lambda: an.get_bowling_stats(deliveries_df),
+        'get_bowling_stats(player)': lambda: an.get_bowling_stats(deliveries_df, player),
+        'get_bowling_stats(season)': lambda: an.get_bowling_stats(deliveries_df, matches_df=matches_df, seasons=season),
+        'get_player_comparison': lambda: an.get_player_comparison(deliveries_df, [player]),
+        'get_top_run_scorers': lambda: an.get_top_run_scorers(deliveries_df, 10),
+        'get_top_wicket_takers': lambda: an.get_top_wicket_takers(deliveries_df, 10),
+        'get_leaderboard(strike_rate)': lambda: an.get_leaderboard(deliveries_df, 'strike_rate', 10),
+        'get_team_stats': lambda: an.get_team_stats(matches_df),
+        'get_team_performance_by_season': lambda: an.get_team_performance_by_season(matches_df, teams[0]),
+        'get_head_to_head': lambda: an.get_head_to_head(matches_df, teams[0], teams[1]),
+        'get_matches_by_season': lambda: an.get_matches_by_season(matches_df),
+        'get_venue_stats': lambda: an.get_venue_stats(matches_df),
+        'get_toss_impact': lambda: an.get_toss_impact(matches_df),
+        'get_season_winners': lambda: an.get_season_winners(matches_df),
+        'get_all_players': lambda: an.get_all_players(deliveries_df),
+        'get_all_teams': lambda: an.get_all_teams(matches_df),
+        'get_seasons': lambda: an.get_seasons(matches_df),
+    }
+
+
+# ==================== SUITE FUNCTIONS ====================
+
+def run_suite(scales=DEFAULT_SCALES, repeat=3, output=None, baseline=None, threshold=REGRESSION_THRESHOLD):
+    """
+    Time every analysis function on the real data and on synthetic data
+
+    Parameters:
+        scales: Synthetic dataset sizes, in copies of the match list
+        repeat: Number of timed runs per case
+        output: Path of a JSON file to save the results to (optional)
+        baseline: Path of a JSON file to compare the results with (optional)
+        threshold: Slowdown against the baseline counted as a regression
+    """
+    print("=" * 60)
+    print("IPL Analysis Benchmark Suite")
+    print("=" * 60)
+    print()
+
+    matches_df, deliveries_df = an.load_data()
+    if matches_df is None:
+        print("❌ ERROR: data/matches.csv not found! Run validate_data.py first.")
+        sys.exit(1)
+
+    results = []
+    datasets = []
+    if deliveries_df is not None:
+        load_time = time_function(an.load_data, repeat=repeat)
+        results.append({
+            'dataset': 'real', 'rows': len(deliveries_df), 'case': 'load_data',
+            'cold_ms': round(load_time * 1000, 3), 'warm_ms': None, 'peak_mb': None,
+        })
+        datasets.append(('real', matches_df, deliveries_df))
+        print(f"⏱️  load_data: {load_time * 1000:.1f} ms")
+        print()
+    else:
+        print("⚠️  data/deliveries.csv not found, using synthetic data only")
+        print()
+
+    for scale in scales:
+        datasets.append((f'synthetic-{scale}x', *generate_synthetic_data(matches_df, scale)))
+
+    for name, matches, deliveries in datasets:
+        print(f"📊 {name.upper()}: {len(deliveries):,} deliveries, {len(matches):,} matches")
+        for case, func in benchmark_cases(matches, deliveries).items():
+            result = {'dataset': name, 'rows': len(deliveries), 'case': case, **measure(func, repeat)}
+            results.append(result)
+            print(f"   {case:<32} cold {result['cold_ms']:9.1f} ms   "
+                  f"warm {result['warm_ms']:8.2f} ms   peak {result['peak_mb']:7.1f} MB")
+        print()
+        an.clear_derived()
+
+    if output:
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'cpus': os.cpu_count(),
+            'results': results,
+        }
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results saved to {output}")
+        print()
+
+    if baseline and compare_results(baseline, results, threshold):
+        sys.exit(1)
+
+
+def compare_results(baseline_path, results, threshold=REGRESSION_THRESHOLD):
+    """
+    Print the change of every case against a saved baseline
+
+    Parameters:
+        baseline_path: Path of a JSON file saved with --output
+        results: List of results of the current run
+        threshold: Slowdown counted as a regression (default: 10%)
+
+    Returns:
+        Number of cases whose cold time regressed by more than threshold
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['dataset'], r['case']): r for r in json.load(f)['results']}
+
+    print("=" * 60)
+    print(f"Comparison with {baseline_path}")
+    print("=" * 60)
+    print()
+
+    regressions = 0
+    for result in results:
+        previous = baseline.get((result['dataset'], result['case']))
+        if not previous or not previous['cold_ms']:
+            continue
+
+        change = result['cold_ms'] / previous['cold_ms'] - 1
+        regressed = change > threshold
+        regressions += regressed
+        print(f"   {'❌' if regressed else '✅'} {result['dataset']:<16} {result['case']:<32} "
+              f"{previous['cold_ms']:9.1f} -> {result['cold_ms']:9.1f} ms ({change:+.0%})")
+
+    print()
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    print()
+    return regressions
+
+
+# ==================== LEGACY AND PARALLEL FUNCTIONS ====================
+
+def fresh_batting_stats(deliveries_df):
+    """Batting table computed from scratch, bypassing the league table cache"""
+    return an.build_batting_table(an.compute_batting_counts(deliveries_df))
+
+
+def fresh_bowling_stats(deliveries_df):
+    """Bowling table computed from scratch, bypassing the league table cache"""
+    return an.build_bowling_table(an.compute_bowling_counts(deliveries_df))
+
+
+def serial_player_stats(deliveries_df):
+    """Single-process batting and bowling tables, computed from scratch"""
+    return fresh_batting_stats(deliveries_df), fresh_bowling_stats(deliveries_df)
+
+
+def compare(label, legacy_func, current_func, deliveries_df):
+    """Print the timings of the legacy and current implementation"""
+    legacy = time_function(legacy_func, deliveries_df)
+    current = time_function(current_func, deliveries_df)
+    print(f"   {label:<20} legacy {legacy * 1000:8.1f} ms   "
+          f"current {current * 1000:8.1f} ms   speedup {legacy / current:5.2f}x")
+
+
+def run_legacy(deliveries_df):
+    """Compare the original per-column groupbys with the single-pass counts"""
+    print("⏱️  PLAYER STATISTICS (best of 5):")
+    compare('get_batting_stats', legacy_batting_stats, fresh_batting_stats, deliveries_df)
+    compare('get_bowling_stats', legacy_bowling_stats, fresh_bowling_stats, deliveries_df)
+    print()
+
+
+def run_parallel(deliveries_df):
+    """Time the parallel engine with an increasing number of workers"""
+    print("⏱️  PARALLEL ENGINE SCALING (best of 3):")
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    baseline = None
+    for workers in worker_counts:
+        elapsed = time_function(parallel.parallel_player_stats, deliveries_df, workers, repeat=3)
+        baseline = baseline or elapsed
+        print(f"   {workers:>2} workers   {elapsed * 1000:8.1f} ms   speedup {baseline / elapsed:5.2f}x")
+    print(f"   (single process, no pool: "
+          f"{time_function(serial_player_stats, deliveries_df, repeat=3) * 1000:.1f} ms)")
+    print()
+
+
+def load_deliveries():
+    """Load the real deliveries, or exit if the data files are missing"""
+    print("=" * 60)
+    print("IPL Analysis Benchmarks")
+    print("=" * 60)
+    print()
+
+    _, deliveries_df = an.load_data()
+    if deliveries_df is None:
+        print("❌ ERROR: data files not found! Run validate_data.py first.")
+        sys.exit(1)
+
+    print(f"📊 Deliveries: {len(deliveries_df):,} rows")
+    print()
+    return deliveries_df
+
+
+# ==================== API FUNCTIONS ====================
+
+def api_targets(matches_df, deliveries_df, players=40):
+    """
+    Request targets that cover every kind of API endpoint
+
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+        players: Number of players to request player endpoints for
+
+    Returns:
+        List of distinct targets, e.g. '/teams/stats?season=2016'
+    """
+    seasons = [str(season) for season in an.get_seasons(matches_df)]
+    teams = an.get_all_teams(matches_df)
+    names = an.get_all_players(deliveries_df)[:players]
+
+    targets = ['/players', '/teams', '/seasons', '/seasons/matches', '/seasons/winners', '/venues', '/toss']
+    targets += [f'/leaderboard?stat={stat}' for stat in an.LEADERBOARD_STATS]
+    for season in seasons:
+        targets += [f'/teams/stats?season={season}', f'/venues?season={season}',
+                    f'/head-to-head?season={season}']
+    for team, opponent in zip(teams, teams[1:]):
+        targets += [f'/teams/seasons?{urlencode({"team": team})}',
+                    f'/head-to-head?{urlencode({"team1": team, "team2": opponent})}']
+    for player in names:
+        query = urlencode({'player': player})
+        targets += [f'/players/batting?{query}', f'/players/bowling?{query}',
+                    f'/players/phases?{query}', f'/matchups?{urlencode({"batter": player})}']
+    return targets
+
+
+def start_api_server():
+    """
+    Start api_server.py in a separate process on a free local port
+
+    Returns:
+        tuple: (subprocess.Popen, port)
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_server.py')
+    process = subprocess.Popen([sys.executable, script, '--port', str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait until the server has loaded the data and answers
+    deadline = time.perf_counter() + 60
+    while time.perf_counter() < deadline and process.poll() is None:
+        try:
+            status, _ = asyncio.run(_single_request(port, '/health'))
+            if status == 200:
+                return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("api_server.py did not start (are the data files in place?)")
+
+
+async def _single_request(port, target):
+    """Send one request on a new connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        return await _request(reader, writer, target)
+    finally:
+        writer.close()
+
+
+async def _request(reader, writer, target):
+    """Send a GET request on an open connection and read the response"""
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    await writer.drain()
+
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+    status = int(head.split(' ', 2)[1])
+    length = 0
+    for line in head.split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return status, body
+
+
+async def _load(port, targets, concurrency):
+    """
+    Send all targets over a number of keep-alive connections
+
+    Returns:
+        tuple: (wall time in seconds, list of latencies in seconds, error count)
+    """
+    queue = list(reversed(targets))
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            while queue:
+                target = queue.pop()
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, target)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, errors
+
+
+def run_api(concurrency_levels=DEFAULT_CONCURRENCY, requests=2000):
+    """
+    Measure the requests/second of the API server at several concurrencies
+
+    Every concurrency level gets a fresh server: the cold pass requests each
+    target once with empty caches, the warm pass repeats the targets until
+    the given number of requests, answered from the response cache.
+    """
+    print("=" * 60)
+    print("IPL API Benchmarks")
+    print("=" * 60)
+    print()
+
+    matches_df, deliveries_df = an.load_data()
+    if matches_df is None or deliveries_df is None:
+        print("❌ ERROR: data files not found! Run validate_data.py first.")
+        sys.exit(1)
+
+    targets = api_targets(matches_df, deliveries_df)
+    warm_targets = [targets[i % len(targets)] for i in range(requests)]
+    print(f"🌐 {len(targets)} distinct targets, {requests:,} warm requests per level")
+    print()
+    print(f"   {'clients':>7}   {'pass':<4}   {'req/s':>8}   {'p50 ms':>7}   {'p95 ms':>7}   {'errors':>6}")
+
+    for concurrency in concurrency_levels:
+        process, port = start_api_server()
+        try:
+            for label, batch in (('cold', targets), ('warm', warm_targets)):
+                elapsed, latencies, errors = asyncio.run(_load(port, batch, concurrency))
+                p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+                print(f"   {concurrency:>7}   {label:<4}   {len(batch) / elapsed:8.0f}   "
+                      f"{p50:7.2f}   {p95:7.2f}   {errors:>6}")
+        finally:
+            process.terminate()
+            process.wait()
+    print()
+
+
+# ==================== STARTUP FUNCTIONS ====================
+
+def app_pages():
+    """
+    Pages of the Streamlit app, as named in their URL
+
+    Returns:
+        List of page names, with '' for the home page (app.py)
+    """
+    pages_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+    return [''] + sorted(name[:-3] for name in os.listdir(pages_dir) if name.endswith('.py'))
+
+
+def time_startup(page):
+    """
+    Launch the Streamlit app in a new process and open one page
+
+    Times are measured from the process launch, as a browser opening the
+    page right away would see them: until the server answers its health
+    check, until the first element of the page arrives (first paint) and
+    until the page script has finished.
+
+    Parameters:
+        page: Page name from app_pages()
+
+    Returns:
+        Dictionary with ready, first_paint and complete times in seconds
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', app, '--server.headless', 'true',
+         '--server.address', '127.0.0.1', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'false'],
+        cwd=os.path.dirname(app), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        return asyncio.run(asyncio.wait_for(_open_page(port, page, start, process), timeout=120))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def _open_page(port, page, start, process):
+    """Wait for the server, request a page over the websocket and time its messages"""
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError("streamlit exited before serving the app")
+        try:
+            status, _ = await _single_request(port, '/_stcore/health')
+            if status == 200:
+                break
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(0.02)
+    times = {'ready': time.perf_counter() - start}
+
+    reader, writer = await _websocket_connect(port, '/_stcore/stream')
+    try:
+        message = BackMsg()
+        message.rerun_script.page_name = page
+        message.rerun_script.query_string = ''
+        _websocket_send(writer, message.SerializeToString())
+        await writer.drain()
+
+        while 'complete' not in times:
+            payload = await _websocket_receive(reader, writer)
+            if payload is None:
+                raise RuntimeError("streamlit closed the connection")
+            forward = ForwardMsg()
+            forward.ParseFromString(payload)
+            kind = forward.WhichOneof('type')
+
+            if kind == 'page_not_found':
+                raise RuntimeError(f"page not found: {page}")
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                times.setdefault('first_paint', time.perf_counter() - start)
+            elif kind == 'script_finished':
+                times['complete'] = time.perf_counter() - start
+    finally:
+        writer.close()
+
+    times.setdefault('first_paint', times['complete'])
+    return times
+
+
+async def _websocket_connect(port, path):
+    """Open a websocket (RFC 6455) connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\n'
+                  f'Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n'
+                  f'Sec-WebSocket-Version: 13\r\n\r\n').encode())
+    await writer.drain()
+
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+    if int(head.split(' ', 2)[1]) != 101:
+        writer.close()
+        raise RuntimeError(f"websocket upgrade refused: {head.splitlines()[0]}")
+    return reader, writer
+
+
+def _websocket_send(writer, payload, opcode=0x2):
+    """Queue one masked client frame (binary by default)"""
+    mask = os.urandom(4)
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, 0x80 | length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 0x80 | 126]) + length.to_bytes(2, 'big')
+    else:
+        header = bytes([0x80 | opcode, 0x80 | 127]) + length.to_bytes(8, 'big')
+    masked = (np.frombuffer(payload, dtype=np.uint8) ^ np.resize(np.frombuffer(mask, dtype=np.uint8), length))
+    writer.write(header + mask + masked.tobytes())
+
+
+async def _websocket_receive(reader, writer):
+    """Read one message, joining fragments and answering pings; None when closed"""
+    message = b''
+    while True:
+        first, second = await reader.readexactly(2)
+        length = second & 0x7f
+        if length == 126:
+            length = int.from_bytes(await reader.readexactly(2), 'big')
+        elif length == 127:
+            length = int.from_bytes(await reader.readexactly(8), 'big')
+        payload = await reader.readexactly(length)
+
+        opcode = first & 0x0f
+        if opcode == 0x8:
+            return None
+        if opcode == 0x9:
+            _websocket_send(writer, payload, opcode=0xA)
+            continue
+        if opcode == 0xA:
+            continue
+
+        message += payload
+        if first & 0x80:
+            return message
+
+
+def run_startup(pages=None, runs=DEFAULT_STARTUP_RUNS):
+    """
+    Measure the cold start of every page, from process launch to first paint
+
+    Each run launches a new Streamlit server, so nothing is imported, loaded
+    or memoized yet; the columnar cache in data/.cache is used as usual.
+    """
+    print("=" * 60)
+    print("IPL App Startup Benchmarks")
+    print("=" * 60)
+    print()
+
+    pages = app_pages() if not pages else pages
+    print(f"🚀 {runs} cold launches per page, median times from launch")
+    print()
+    print(f"   {'page':<18}   {'ready ms':>8}   {'paint ms':>8}   {'done ms':>8}")
+
+    for page in pages:
+        runs_times = [time_startup(page) for _ in range(runs)]
+        ready, first_paint, complete = (
+            np.median([times[key] for times in runs_times]) * 1000
+            for key in ('ready', 'first_paint', 'complete')
+        )
+        print(f"   {page or 'home':<18}   {ready:8.0f}   {first_paint:8.0f}   {complete:8.0f}")
+    print()
+
+
+def main():
+    """Parse the command line and run the selected benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark the IPL analysis functions")
+    commands = parser.add_subparsers(dest='command')
+
+    suite = commands.add_parser('suite', help="Time every analysis function (default)")
+    suite.add_argument('--scales', type=int, nargs='*', default=DEFAULT_SCALES,
+                       help="Synthetic dataset sizes in copies of matches.csv (default: 1 10)")
+    suite.add_argument('--repeat', type=int, default=3, help="Timed runs per case (default: 3)")
+    suite.add_argument('--output', help="Save the results to this JSON file")
+    suite.add_argument('--compare', help="Compare with a JSON file saved by --output, exit 1 on regressions")
+    suite.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                       help="Slowdown counted as a regression (default: 0.10)")
+
+    commands.add_parser('legacy', help="Compare the original groupbys with the current ones")
+    commands.add_parser('parallel', help="Time the parallel engine with 1..N workers")
+
+    api = commands.add_parser('api', help="Measure requests/second of the JSON API server")
+    api.add_argument('--concurrency', type=int, nargs='*', default=DEFAULT_CONCURRENCY,
+                     help="Numbers of concurrent clients (default: 1 4 16 64)")
+    api.add_argument('--requests', type=int, default=2000, help="Warm requests per level (default: 2000)")
+
+    startup = commands.add_parser('startup', help="Time each page from server launch to first paint")
+    startup.add_argument('--pages', nargs='*', help="Page names, '' for the home page (default: all)")
+    startup.add_argument('--runs', type=int, default=DEFAULT_STARTUP_RUNS,
+                         help=f"Launches per page (default: {DEFAULT_STARTUP_RUNS})")
+
+    args = parser.parse_args()
+
+    if args.command == 'legacy':
+        run_legacy(load_deliveries())
+    elif args.command == 'parallel':
+        run_parallel(load_deliveries())
+    elif args.command == 'api':
+        run_api(args.concurrency, args.requests)
+    elif args.command == 'startup':
+        run_startup(args.pages, args.runs)
+    elif args.command == 'suite':
+        run_suite(args.scales, args.repeat, args.output, args.compare, args.threshold)
+    else:
+        run_suite()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""
+Columnar Data Cache
+This module keeps a binary copy of each CSV file (one .npy file per column)
+so the app can memory-map the data instead of re-parsing the CSV text
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_DIR = os.path.join('data', '.cache')
+
+# Bump when the on-disk layout changes so old caches are rebuilt
+CACHE_FORMAT = 1
+
+
+# ==================== SOURCE FILE FUNCTIONS ====================
+
+def file_digest(path):
+    """
+    Calculate a content hash of a file
+
+    Parameters:
+        path: Path to the file
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(csv_path):
+    """
+    Get the size and modification time of a CSV file
+
+    Parameters:
+        csv_path: Path to the CSV file
+
+    Returns:
+        Dictionary with size and mtime_ns
+    """
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+# ==================== CACHE READ/WRITE FUNCTIONS ====================
+
+def read_csv_cached(csv_path, dtype=None, cache_dir=CACHE_DIR, columns=None):
+    """
+    Read a CSV file through the columnar cache
+
+    The cache is used when the CSV has the same size and mtime as when the
+    cache was built (or, if only the mtime changed, the same content hash).
+    Otherwise the CSV is parsed again and the cache is rebuilt.
+
+    Parameters:
+        csv_path: Path to the CSV file
+        dtype: Column dtypes passed to pd.read_csv (optional)
+        cache_dir: Directory holding the cached tables
+        columns: Columns to read (default: all); from a fresh cache only
+                 their files are opened
+
+    Returns:
+        DataFrame with the CSV contents
+    """
+    manifest = _fresh_manifest(csv_path, dtype, cache_dir)
+    if manifest is not None:
+        return _read_table(_table_dir(csv_path, cache_dir), manifest, columns)
+
+    df = _rebuild_table(csv_path, dtype, cache_dir)
+    return df if columns is None else df[[column for column in df.columns if column in columns]]
+
+
+def read_csv_columns(csv_path, dtype=None, cache_dir=CACHE_DIR):
+    """
+    Get the columns of a CSV file and the distinct values of its string columns
+
+    Only the cache manifest is read, so no column data is loaded (the cache
+    is rebuilt first if the CSV changed).
+
+    Parameters:
+        csv_path: Path to the CSV file
+        dtype: Column dtypes passed to pd.read_csv (optional)
+        cache_dir: Directory holding the cached tables
+
+    Returns:
+        Dictionary mapping each column, in file order, to its list of
+        categories (None for numeric columns)
+    """
+    manifest = _fresh_manifest(csv_path, dtype, cache_dir)
+    if manifest is None:
+        df = _rebuild_table(csv_path, dtype, cache_dir)
+        return {column: _distinct_values(df[column]) for column in df.columns}
+    return {entry['name']: entry.get('categories') for entry in manifest['columns']}
+
+
+def source_digest(csv_path, dtype=None, cache_dir=CACHE_DIR):
+    """
+    Get the content hash of a CSV file without reading it again
+
+    The hash recorded when the cache was built is used while the cache is
+    fresh; otherwise the file is hashed.
+
+    Parameters:
+        csv_path: Path to the CSV file
+        dtype: Column dtypes the cache was built with (optional)
+        cache_dir: Directory holding the cached tables
+
+    Returns:
+        Hex digest string, as from file_digest()
+    """
+    manifest = _fresh_manifest(csv_path, dtype, cache_dir)
+    if manifest is None:
+        return file_digest(csv_path)
+    return manifest['source']['digest']
+
+
+def _distinct_values(series):
+    """Distinct values of a string column as stored in the manifest, None for other columns"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.categories.tolist()
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        return pd.factorize(series)[1].tolist()
+    return None
+
+
+def _fresh_manifest(csv_path, dtype, cache_dir):
+    """Manifest of the cached table of a CSV file, or None if it must be rebuilt"""
+    signature = source_signature(csv_path)
+    table_dir = _table_dir(csv_path, cache_dir)
+    manifest = _read_manifest(table_dir)
+    if manifest is not None and _is_fresh(manifest, csv_path, signature, _dtype_spec(dtype), table_dir):
+        return manifest
+    return None
+
+
+def _rebuild_table(csv_path, dtype, cache_dir):
+    """Parse a CSV file and write its cached table"""
+    signature = source_signature(csv_path)
+    df = pd.read_csv(csv_path, dtype=dtype)
+    try:
+        _write_table(df, _table_dir(csv_path, cache_dir), {
+            **signature,
+            'digest': file_digest(csv_path),
+            'dtype': _dtype_spec(dtype),
+        })
+    except OSError:
+        # A read-only data folder still works, just without the cache
+        pass
+    return df
+
+
+def _table_dir(csv_path, cache_dir):
+    """Directory holding the cached columns of one CSV file"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, name)
+
+
+def _dtype_spec(dtype):
+    """JSON-friendly description of the requested dtypes"""
+    if dtype is None:
+        return None
+    return {column: str(value) for column, value in sorted(dtype.items())}
+
+
+def _read_manifest(table_dir):
+    """Load the manifest of a cached table, or None if there is no valid cache"""
+    try:
+        with open(os.path.join(table_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != CACHE_FORMAT:
+        return None
+    return manifest
+
+
+def _is_fresh(manifest, csv_path, signature, dtype_spec, table_dir):
+    """Check whether a cached table still matches its CSV file"""
+    source = manifest['source']
+    if source['dtype'] != dtype_spec or source['size'] != signature['size']:
+        return False
+    if source['mtime_ns'] == signature['mtime_ns']:
+        return True
+
+    # Same size but touched: only rebuild if the content actually changed
+    if source['digest'] != file_digest(csv_path):
+        return False
+    manifest['source']['mtime_ns'] = signature['mtime_ns']
+    try:
+        _write_manifest(table_dir, manifest)
+    except OSError:
+        pass
+    return True
+
+
+def _write_manifest(table_dir, manifest):
+    """Atomically replace the manifest of a cached table"""
+    path = os.path.join(table_dir, 'manifest.json')
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def _write_table(df, table_dir, source):
+    """
+    Write a DataFrame as one .npy file per column
+
+    String columns are dictionary encoded: the integer codes go to the .npy
+    file and the distinct values are stored in the manifest.
+    """
+    os.makedirs(table_dir, exist_ok=True)
+
+    # Remove the manifest first so a half-written cache is never used
+    manifest_path = os.path.join(table_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        filename = f'{position}.npy'
+        entry = {'name': column, 'file': filename}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            entry['kind'] = 'category'
+            entry['categories'] = series.cat.categories.tolist()
+        elif series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            codes, uniques = pd.factorize(series)
+            values = codes.astype(_code_dtype(len(uniques)))
+            entry['kind'] = 'string'
+            entry['categories'] = uniques.tolist()
+        else:
+            values = series.to_numpy()
+            entry['kind'] = 'numeric'
+
+        np.save(os.path.join(table_dir, filename), values, allow_pickle=False)
+        columns.append(entry)
+
+    _write_manifest(table_dir, {
+        'format': CACHE_FORMAT,
+        'source': source,
+        'rows': len(df),
+        'columns': columns,
+    })
+
+
+def _read_table(table_dir, manifest, columns=None):
+    """Rebuild a DataFrame (or some of its columns) from memory-mapped column files"""
+    entries = [entry for entry in manifest['columns'] if columns is None or entry['name'] in columns]
+    data = {}
+    for entry in entries:
+        values = np.load(os.path.join(table_dir, entry['file']), mmap_mode='r')
+
+        if entry['kind'] == 'category':
+            data[entry['name']] = pd.Categorical.from_codes(values, categories=entry['categories'])
+        elif entry['kind'] == 'string':
+            # Append a NaN slot so that missing values (code -1) decode to NaN
+            lookup = np.array(entry['categories'] + [np.nan], dtype=object)
+            data[entry['name']] = lookup[values]
+        else:
+            data[entry['name']] = np.asarray(values)
+
+    return pd.DataFrame(data, columns=[entry['name'] for entry in entries])
+
+
+def _code_dtype(n_values):
+    """Smallest signed integer dtype that can hold n_values codes plus -1"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_values < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+# ==================== ARTIFACT FUNCTIONS ====================
+
+def describe_source(csv_path):
+    """
+    Get the signature and content hash of a source file
+
+    Parameters:
+        csv_path: Path to the CSV file
+
+    Returns:
+        Dictionary with size, mtime_ns and digest
+    """
+    return {**source_signature(csv_path), 'digest': file_digest(csv_path)}
+
+
+def source_matches(csv_path, source):
+    """
+    Check whether a file is still the one described by describe_source()
+
+    Parameters:
+        csv_path: Path to the CSV file
+        source: Dictionary returned by describe_source()
+
+    Returns:
+        True if the file has the same size and mtime or the same content
+    """
+    try:
+        signature = source_signature(csv_path)
+        if signature['size'] != source['size']:
+            return False
+        return signature['mtime_ns'] == source['mtime_ns'] or file_digest(csv_path) == source['digest']
+    except OSError:
+        return False
+
+
+def write_artifacts(artifacts, artifact_dir, meta=None, binary=()):
+    """
+    Write results as one JSON file per artifact
+
+    DataFrames and Series are written in the pandas 'table' layout, which
+    keeps categoricals, with the exact numeric dtypes in the manifest;
+    everything else must be JSON serializable. The artifacts named in
+    binary are written as .npz files instead (see _encode_arrays), which
+    are much faster to read back. The manifest is written last, so a
+    directory whose writing was interrupted is never read.
+
+    Parameters:
+        artifacts: Dictionary mapping artifact name to value
+        artifact_dir: Directory to write to
+        meta: Extra JSON-serializable information for the manifest
+        binary: Names of the artifacts to write as .npz files
+
+    Returns:
+        List of the written file paths
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+
+    manifest_path = os.path.join(artifact_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    entries = {}
+    paths = []
+    for name, value in artifacts.items():
+        filename = f'{name}.npz' if name in binary else f'{name}.json'
+        path = os.path.join(artifact_dir, filename)
+
+        entry = {'file': filename}
+        if name in binary:
+            arrays = {}
+            entry['kind'] = 'arrays'
+            entry['layout'] = _encode_arrays(value, arrays)
+            np.savez(path, **arrays)
+        elif isinstance(value, (pd.DataFrame, pd.Series)):
+            table = value if isinstance(value, pd.DataFrame) else value.to_frame(
+                name=value.name if value.name is not None else 'values'
+            )
+            entry['kind'] = 'frame' if isinstance(value, pd.DataFrame) else 'series'
+            entry['dtypes'] = {
+                column: dtype.str
+                for column, dtype in table.dtypes.items()
+                if isinstance(dtype, np.dtype) and dtype.kind in 'biuf'
+            }
+            table.to_json(path, orient='table', double_precision=15)
+        else:
+            entry['kind'] = 'json'
+            with open(path, 'w') as f:
+                json.dump(value, f, default=json_default)
+
+        entries[name] = entry
+        paths.append(path)
+
+    _write_manifest(artifact_dir, {
+        'format': CACHE_FORMAT,
+        'meta': meta or {},
+        'artifacts': entries,
+    })
+    paths.append(manifest_path)
+    return paths
+
+
+def read_artifacts(artifact_dir, names=None):
+    """
+    Read artifacts written by write_artifacts()
+
+    Parameters:
+        artifact_dir: Directory to read from
+        names: Names of the artifacts to read (default: all)
+
+    Returns:
+        tuple: (meta dictionary, dictionary mapping artifact name to value)
+
+    Raises:
+        FileNotFoundError: If the directory holds no complete artifacts
+    """
+    manifest = _read_manifest(artifact_dir)
+    if manifest is None:
+        raise FileNotFoundError(os.path.join(artifact_dir, 'manifest.json'))
+
+    artifacts = {}
+    for name, entry in manifest['artifacts'].items():
+        if names is not None and name not in names:
+            continue
+        path = os.path.join(artifact_dir, entry['file'])
+
+        if entry['kind'] == 'json':
+            with open(path) as f:
+                artifacts[name] = json.load(f)
+        elif entry['kind'] == 'arrays':
+            with np.load(path) as npz:
+                artifacts[name] = _decode_arrays(entry['layout'], {key: npz[key] for key in npz.files})
+        else:
+            table = pd.read_json(path, orient='table', precise_float=True).astype(entry['dtypes'])
+            artifacts[name] = table.iloc[:, 0] if entry['kind'] == 'series' else table
+
+    return manifest['meta'], artifacts
+
+
+def json_default(value):
+    """Turn numpy scalars and arrays into plain JSON values"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (np.ndarray, pd.Index)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_arrays(value, arrays):
+    """
+    Describe a value for an .npz artifact, collecting its arrays
+
+    The value may be a numeric or boolean array, an Index, a DataFrame with
+    a default index and numeric, boolean and categorical columns, a
+    dictionary with string keys of any of these, or a JSON-serializable
+    value.
+
+    Parameters:
+        value: Value to describe
+        arrays: Dictionary the arrays are added to, by their key in the file
+
+    Returns:
+        JSON-serializable layout, read back by _decode_arrays()
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in 'biuf':
+            raise TypeError(f"Cannot store {value.dtype} arrays in an .npz artifact")
+        key = f'a{len(arrays)}'
+        arrays[key] = value
+        return {'array': key}
+    if isinstance(value, pd.Index):
+        return {'index': value.tolist(), 'dtype': str(value.dtype), 'name': value.name}
+    if isinstance(value, pd.DataFrame):
+        columns = []
+        for column, series in value.items():
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                layout = {
+                    'categorical': _encode_arrays(series.cat.codes.to_numpy(), arrays),
+                    'categories': _encode_arrays(series.cat.categories, arrays),
+                }
+            else:
+                layout = _encode_arrays(series.to_numpy(), arrays)
+            columns.append([column, layout])
+        return {'frame': columns}
+    if isinstance(value, dict):
+        return {'dict': {key: _encode_arrays(item, arrays) for key, item in value.items()}}
+    return {'value': json.loads(json.dumps(value, default=json_default))}
+
+
+def _decode_arrays(layout, arrays):
+    """Rebuild a value described by _encode_arrays() from the arrays of its file"""
+    if 'array' in layout:
+        return arrays[layout['array']]
+    if 'index' in layout:
+        dtype = object if layout['dtype'] == 'object' else None
+        return pd.Index(layout['index'], dtype=dtype, name=layout['name'])
+    if 'frame' in layout:
+        columns = {}
+        for column, column_layout in layout['frame']:
+            if 'categorical' in column_layout:
+                columns[column] = pd.Categorical.from_codes(
+                    _decode_arrays(column_layout['categorical'], arrays),
+                    categories=_decode_arrays(column_layout['categories'], arrays)
+                )
+            else:
+                columns[column] = _decode_arrays(column_layout, arrays)
+        return pd.DataFrame(columns)
+    if 'dict' in layout:
+        return {key: _decode_arrays(item, arrays) for key, item in layout['dict'].items()}
+    return layout['value']
@@ -0,0 +1,273 @@
+"""
+Incremental Statistics Refresh
+This module keeps running aggregates on disk and folds in only the matches
+added to the CSV files since the last refresh
+
+Run this script after appending new matches to the data files:
+    python incremental.py
+
+New matches must be appended to the end of both CSV files, one whole match
+at a time. If a CSV is rewritten instead of appended to, the aggregates are
+rebuilt from scratch.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+import analysis as an
+import schema
+
+
+AGGREGATES_PATH = os.path.join('data', '.cache', 'aggregates.pkl')
+
+# Number of bytes before the last read position used to detect a rewritten file
+_TAIL_BYTES = 1 << 16
+
+
+# ==================== AGGREGATE STORAGE FUNCTIONS ====================
+
+def empty_aggregates():
+    """
+    Create aggregates that contain no matches
+
+    Returns:
+        Dictionary of raw counts (see analysis.compute_*_counts)
+    """
+    no_deliveries = pd.DataFrame(columns=list(schema.DELIVERIES_SCHEMA)).astype(schema.DELIVERIES_SCHEMA)
+    no_matches = pd.DataFrame(columns=list(schema.MATCHES_SCHEMA)).astype(schema.MATCHES_SCHEMA)
+
+    return {
+        'match_ids': set(),
+        'deliveries_offset': 0,
+        'deliveries_tail': None,
+        'batting': an.compute_batting_counts(no_deliveries),
+        'bowling': an.compute_bowling_counts(no_deliveries),
+        'teams': an.compute_team_counts(no_matches),
+        'venues': an.compute_venue_counts(no_matches),
+        'toss': an.compute_toss_counts(no_matches),
+    }
+
+
+def load_aggregates(path=AGGREGATES_PATH):
+    """
+    Load the saved aggregates
+
+    Parameters:
+        path: Path of the aggregates file
+
+    Returns:
+        Dictionary of raw counts, empty if nothing was saved yet
+    """
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return empty_aggregates()
+
+
+def save_aggregates(aggregates, path=AGGREGATES_PATH):
+    """
+    Save the aggregates, replacing the previous file atomically
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+        path: Path of the aggregates file
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(aggregates, f)
+    os.replace(tmp_path, path)
+
+
+# ==================== REFRESH FUNCTIONS ====================
+
+def refresh_aggregates(aggregates, matches_path=an.MATCHES_CSV, deliveries_path=an.DELIVERIES_CSV):
+    """
+    Fold the matches added since the last refresh into the aggregates
+
+    Only the rows appended to deliveries.csv since the last refresh are
+    parsed, so the cost is proportional to the new data. New matches are
+    found by id and new deliveries by byte offset, so the files may be
+    appended to at different times.
+
+    Parameters:
+        aggregates: Dictionary from load_aggregates
+        matches_path: Path to matches.csv
+        deliveries_path: Path to deliveries.csv
+
+    Returns:
+        tuple: (updated aggregates, number of new matches)
+    """
+    if not _is_append_only(aggregates, deliveries_path):
+        aggregates = empty_aggregates()
+
+    # matches.csv is small, new matches are found by their id
+    matches = pd.read_csv(matches_path, dtype=schema.MATCHES_SCHEMA)
+    new_matches = matches[~matches['id'].isin(aggregates['match_ids'])]
+
+    # Every row after the offset is new, whether or not its match row was
+    # already added by an earlier refresh (the two files are appended to
+    # separately), so all of them are folded in
+    new_deliveries, offset = read_new_deliveries(deliveries_path, aggregates['deliveries_offset'])
+
+    updated = {
+        'match_ids': aggregates['match_ids'] | set(new_matches['id'].tolist()),
+        'deliveries_offset': offset,
+        'deliveries_tail': _tail_digest(deliveries_path, offset),
+        'batting': an.merge_counts([aggregates['batting'], an.compute_batting_counts(new_deliveries)]),
+        'bowling': an.merge_counts([aggregates['bowling'], an.compute_bowling_counts(new_deliveries)]),
+        'teams': an.merge_counts([aggregates['teams'], an.compute_team_counts(new_matches)]),
+        'venues': an.merge_counts([aggregates['venues'], an.compute_venue_counts(new_matches)]),
+        'toss': an.merge_counts([aggregates['toss'], an.compute_toss_counts(new_matches)]),
+    }
+    return updated, len(new_matches)
+
+
+def read_new_deliveries(deliveries_path, offset):
+    """
+    Read the deliveries appended after a byte offset
+
+    Parameters:
+        deliveries_path: Path to deliveries.csv
+        offset: Byte offset up to which the file was already read
+
+    Returns:
+        tuple: (DataFrame with the new rows, byte offset of the end of the last complete row)
+    """
+    with open(deliveries_path, 'rb') as f:
+        header = f.readline()
+        start = max(offset, len(header))
+        f.seek(start)
+        data = f.read()
+
+    # A row that is still being written is left for the next refresh
+    end = data.rfind(b'\n') + 1
+    columns = header.decode().strip().split(',')
+    new_rows = pd.read_csv(
+        io.BytesIO(data[:end]), header=None, names=columns, dtype=schema.DELIVERIES_SCHEMA
+    )
+
+    return new_rows, start + end
+
+
+def _tail_digest(path, offset):
+    """Hash of the bytes just before offset"""
+    with open(path, 'rb') as f:
+        f.seek(max(offset - _TAIL_BYTES, 0))
+        return hashlib.blake2b(f.read(min(offset, _TAIL_BYTES)), digest_size=16).hexdigest()
+
+
+def _is_append_only(aggregates, deliveries_path):
+    """Check that deliveries.csv only grew since the last refresh"""
+    offset = aggregates['deliveries_offset']
+    if offset == 0:
+        return True
+    if os.path.getsize(deliveries_path) < offset:
+        return False
+    return _tail_digest(deliveries_path, offset) == aggregates['deliveries_tail']
+
+
+# ==================== STATISTICS FUNCTIONS ====================
+
+def get_batting_stats(aggregates, player_name=None):
+    """
+    Get batting statistics from the aggregates
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+        player_name: Specific player name (optional)
+
+    Returns:
+        DataFrame with batting statistics
+    """
+    batting = aggregates['batting']
+    if player_name:
+        batting = batting[batting.index == player_name]
+    return an.build_batting_table(batting)
+
+
+def get_bowling_stats(aggregates, player_name=None):
+    """
+    Get bowling statistics from the aggregates
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+        player_name: Specific player name (optional)
+
+    Returns:
+        DataFrame with bowling statistics
+    """
+    bowling = aggregates['bowling']
+    if player_name:
+        bowling = bowling[bowling.index == player_name]
+    return an.build_bowling_table(bowling)
+
+
+def get_team_stats(aggregates):
+    """
+    Get team statistics from the aggregates
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+
+    Returns:
+        DataFrame with team statistics
+    """
+    return an.build_team_table(aggregates['teams'])
+
+
+def get_venue_stats(aggregates):
+    """
+    Get venue statistics from the aggregates
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+
+    Returns:
+        DataFrame with venue statistics
+    """
+    return an.build_venue_table(aggregates['venues'])
+
+
+def get_toss_impact(aggregates):
+    """
+    Get toss impact statistics from the aggregates
+
+    Parameters:
+        aggregates: Dictionary from refresh_aggregates
+
+    Returns:
+        Dictionary with toss impact statistics
+    """
+    return an.build_toss_impact(aggregates['toss'])
+
+
+def run_refresh():
+    """Refresh the saved aggregates with the new matches"""
+
+    print("=" * 60)
+    print("IPL Incremental Refresh")
+    print("=" * 60)
+    print()
+
+    try:
+        aggregates, new_matches = refresh_aggregates(load_aggregates())
+    except FileNotFoundError as e:
+        print(f"❌ ERROR: {e.filename} not found!")
+        sys.exit(1)
+
+    save_aggregates(aggregates)
+    print(f"✅ Added {new_matches:,} new matches")
+    print(f"   - Matches in aggregates: {len(aggregates['match_ids']):,}")
+    print(f"   - Saved to {AGGREGATES_PATH}")
+    print()
+
+
+if __name__ == "__main__":
+    run_refresh()
@@ -3,28 +3,28 @@ Player Comparison Page
 """
 
 import streamlit as st
-import analysis as an
-import visualizations as viz
 
-st.set_page_config(page_title="Compare Players", page_icon="⚖️", layout="wide")
-
-# Load data
-@st.cache_data
-def load_data():
-    return an.load_data()
+from page_shell import lazy_import
 
-matches_df, deliveries_df = load_data()
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
 
-if matches_df is None or deliveries_df is None:
-    st.error("⚠️ Data files not found!")
-    st.stop()
+st.set_page_config(page_title="Compare Players", page_icon="⚖️", layout="wide")
 
 # ==================== COMPARE PLAYERS PAGE ====================
 
 st.title("⚖️ Compare Players")
 
-# Get all players
-all_players = an.get_all_players(deliveries_df)
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
+
+# The player list is read from data/.cache, without loading data
+all_players = an.get_names('players')
+
+if all_players is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
 
 st.markdown("### Select players to compare (Choose 2-5 players)")
 
@@ -42,14 +42,14 @@ elif len(selected_players) > 5:
 else:
     st.markdown("---")
     
-    # Batting Comparison
-    st.markdown("### 🏏 Batting Comparison")
+    # Load the columns used on this page (shared across all pages)
+    deliveries_df = an.get_deliveries(an.get_player_comparison)
     
-    # Get batting stats for all players
-    all_batting_stats = an.get_batting_stats(deliveries_df)
+    # Get stats for the selected players from the league tables
+    comparison_data, bowling_comparison = an.get_player_comparison(deliveries_df, selected_players)
     
-    # Filter for selected players
-    comparison_data = all_batting_stats[all_batting_stats['Player'].isin(selected_players)]
+    # Batting Comparison
+    st.markdown("### 🏏 Batting Comparison")
     
     if not comparison_data.empty:
         # Display comparison table
@@ -64,13 +64,9 @@ else:
     # Bowling Comparison
     st.markdown("### ⚾ Bowling Comparison")
     
-    # Get bowling stats for all players
-    all_bowling_stats = an.get_bowling_stats(deliveries_df)
-    
-    # Filter for selected players
-    bowling_comparison = all_bowling_stats[all_bowling_stats['Player'].isin(selected_players)]
-    
     if not bowling_comparison.empty:
         st.dataframe(bowling_comparison, use_container_width=True, hide_index=True)
     else:
-        st.info("No bowling statistics available for the selected players.")
\ No newline at end of file
+        st.info("No bowling statistics available for the selected players.")
+
+profiling.show_debug_panel("Compare Players")
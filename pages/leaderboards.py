@@ -0,0 +1,65 @@
+"""
+Configurable Leaderboards Page
+"""
+
+import streamlit as st
+
+from page_shell import lazy_import
+
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
+
+st.set_page_config(page_title="Leaderboards", page_icon="🥇", layout="wide")
+
+# ==================== LEADERBOARDS PAGE ====================
+
+st.title("🥇 Leaderboards")
+
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
+
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    # Stat selection
+    stat = st.selectbox(
+        "Rank by",
+        list(an.LEADERBOARD_STATS),
+        format_func=lambda key: an.LEADERBOARD_STATS[key]['label']
+    )
+
+config = an.LEADERBOARD_STATS[stat]
+
+with col2:
+    top_n = st.slider("Number of players", 5, 20, 10)
+
+with col3:
+    # Minimum qualifier for rate stats
+    minimum = None
+    if 'qualifier' in config:
+        minimum = st.number_input(
+            f"Minimum {config['qualifier'].replace('_', ' ')}",
+            min_value=0,
+            value=config['minimum']
+        )
+
+st.markdown("---")
+
+# Load the columns used on this page (shared across all pages)
+deliveries_df = an.get_deliveries(an.get_leaderboard)
+
+if deliveries_df is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
+
+leaderboard = an.get_leaderboard(deliveries_df, stat, top_n, minimum)
+
+if not leaderboard.empty:
+    st.markdown(f"### {config['label']}")
+    viz.show_leaderboard(leaderboard, config['column'])
+    st.dataframe(leaderboard, use_container_width=True, hide_index=True)
+else:
+    st.warning("No players meet the minimum qualifier.")
+
+profiling.show_debug_panel("Leaderboards")
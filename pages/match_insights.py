@@ -3,27 +3,32 @@ Match Insights and Trends Page
 """
 
 import streamlit as st
-import pandas as pd
-import analysis as an
-import visualizations as viz
 
-st.set_page_config(page_title="Match Insights", page_icon="📊", layout="wide")
-
-# Load data
-@st.cache_data
-def load_data():
-    return an.load_data()
+from page_shell import lazy_import
 
-matches_df, deliveries_df = load_data()
+pd = lazy_import('pandas')
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
 
-if matches_df is None or deliveries_df is None:
-    st.error("⚠️ Data files not found!")
-    st.stop()
+st.set_page_config(page_title="Match Insights", page_icon="📊", layout="wide")
 
 # ==================== MATCH INSIGHTS PAGE ====================
 
 st.title("📊 Match Insights & Trends")
 
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
+
+# Load the columns used on this page (shared across all pages), no
+# ball-by-ball data is needed
+matches_df = an.get_matches(an.get_toss_impact, an.get_venue_stats, an.get_matches_by_season,
+                            an.get_season_winners)
+
+if matches_df is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
+
 # Toss Impact Analysis
 st.markdown("### 🪙 Toss Impact Analysis")
 toss_impact = an.get_toss_impact(matches_df)
@@ -80,4 +85,6 @@ st.markdown("---")
 # IPL Winners
 st.markdown("### 🏆 IPL Champions History")
 season_winners = an.get_season_winners(matches_df)
-st.dataframe(season_winners, use_container_width=True, hide_index=True)
\ No newline at end of file
+st.dataframe(season_winners, use_container_width=True, hide_index=True)
+
+profiling.show_debug_panel("Match Insights")
@@ -0,0 +1,83 @@
+"""
+Batter vs Bowler Matchups Page
+"""
+
+import streamlit as st
+
+from page_shell import lazy_import
+
+an = lazy_import('analysis')
+profiling = lazy_import('profiling')
+
+st.set_page_config(page_title="Matchups", page_icon="🎯", layout="wide")
+
+# ==================== MATCHUPS PAGE ====================
+
+st.title("🎯 Batter vs Bowler Matchups")
+
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an)
+
+# The player list is read from data/.cache, without loading data
+all_players = an.get_names('players')
+
+if all_players is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
+
+col1, col2 = st.columns(2)
+
+with col1:
+    batter = st.selectbox("Batter", all_players, index=0, key='batter')
+with col2:
+    bowler = st.selectbox("Bowler", all_players, index=min(1, len(all_players) - 1), key='bowler')
+
+# Load the columns used on this page (shared across all pages)
+deliveries_df = an.get_deliveries(an.get_matchup, an.get_batter_matchups, an.get_bowler_matchups)
+
+st.markdown("---")
+
+# Head to head record of the pair
+st.markdown(f"### {batter} vs {bowler}")
+matchup = an.get_matchup(deliveries_df, batter, bowler)
+
+if matchup['balls'] > 0:
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    with col1:
+        st.metric("Runs", matchup['runs'])
+    with col2:
+        st.metric("Balls", matchup['balls'])
+    with col3:
+        st.metric("Dismissals", matchup['dismissals'])
+    with col4:
+        st.metric("Strike Rate", f"{matchup['strike_rate']:.2f}")
+    with col5:
+        st.metric("Average", f"{matchup['average']:.2f}")
+else:
+    st.info(f"{batter} has not faced {bowler}.")
+
+st.markdown("---")
+
+# Every opponent of the selected players
+min_balls = st.slider("Minimum balls", 0, 30, 6)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown(f"#### {batter} against all bowlers")
+    batter_matchups = an.get_batter_matchups(deliveries_df, batter, min_balls)
+    if not batter_matchups.empty:
+        st.dataframe(batter_matchups, use_container_width=True, hide_index=True)
+    else:
+        st.info("No matchups with this many balls.")
+
+with col2:
+    st.markdown(f"#### {bowler} against all batters")
+    bowler_matchups = an.get_bowler_matchups(deliveries_df, bowler, min_balls)
+    if not bowler_matchups.empty:
+        st.dataframe(bowler_matchups, use_container_width=True, hide_index=True)
+    else:
+        st.info("No matchups with this many balls.")
+
+profiling.show_debug_panel("Matchups")
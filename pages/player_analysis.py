@@ -3,41 +3,54 @@ Player Statistics Page
 """
 
 import streamlit as st
-import analysis as an
 
-st.set_page_config(page_title="Player Stats", page_icon="👤", layout="wide")
-
-# Load data
-@st.cache_data
-def load_data():
-    return an.load_data()
+from page_shell import lazy_import
 
-matches_df, deliveries_df = load_data()
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
 
-if matches_df is None or deliveries_df is None:
-    st.error("⚠️ Data files not found!")
-    st.stop()
+st.set_page_config(page_title="Player Stats", page_icon="👤", layout="wide")
 
 # ==================== PLAYER ANALYSIS PAGE ====================
 
 st.title("👤 Player Statistics")
 
-# Get all players
-all_players = an.get_all_players(deliveries_df)
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
+
+# Player and season lists are read from data/.cache, without loading data
+all_players = an.get_names('players')
+
+if all_players is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
 
 # Player selection
 selected_player = st.selectbox("Select a Player", all_players, index=0)
 
+# Season filter (all seasons when nothing is selected)
+selected_seasons = st.sidebar.multiselect("Filter by Season", an.get_names('seasons'))
+season_filter = selected_seasons or None
+
+# Load the columns used on this page (shared across all pages)
+matches_df = an.get_matches(an.get_batting_stats, an.get_bowling_stats)
+deliveries_df = an.get_deliveries(
+    an.get_batting_stats, an.get_batting_milestones, an.get_bowling_stats, an.get_bowling_milestones,
+    an.get_player_phase_stats, an.get_top_run_scorers, an.get_top_wicket_takers, an.get_top_scores,
+    an.get_wicket_hauls
+)
+
 st.markdown("---")
 
-# Create tabs for batting and bowling
-tab1, tab2 = st.tabs(["🏏 Batting Statistics", "⚾ Bowling Statistics"])
+# Create tabs for batting, bowling and phases
+tab1, tab2, tab3 = st.tabs(["🏏 Batting Statistics", "⚾ Bowling Statistics", "⏱️ Phases"])
 
 with tab1:
     st.markdown(f"### Batting Performance - {selected_player}")
     
     # Get batting stats
-    player_batting = an.get_batting_stats(deliveries_df, selected_player)
+    player_batting = an.get_batting_stats(deliveries_df, selected_player, matches_df, season_filter)
     
     if not player_batting.empty:
         # Display metrics
@@ -61,6 +74,21 @@ with tab1:
         with col7:
             st.metric("Balls Faced", int(player_batting['Balls_Faced'].values[0]))
         
+        # Milestones
+        batting_milestones = an.get_batting_milestones(deliveries_df, selected_player, matches_df, season_filter)
+        if not batting_milestones.empty:
+            highest_score = int(batting_milestones['Highest_Score'].values[0])
+            not_out = "*" if batting_milestones['Not_Out'].values[0] else ""
+            
+            col8, col9, col10 = st.columns(3)
+            
+            with col8:
+                st.metric("Highest Score", f"{highest_score}{not_out}")
+            with col9:
+                st.metric("Fifties", int(batting_milestones['Fifties'].values[0]))
+            with col10:
+                st.metric("Hundreds", int(batting_milestones['Hundreds'].values[0]))
+        
         # Display detailed stats table
         st.markdown("#### Detailed Statistics")
         st.dataframe(player_batting, use_container_width=True, hide_index=True)
@@ -71,7 +99,7 @@ with tab2:
     st.markdown(f"### Bowling Performance - {selected_player}")
     
     # Get bowling stats
-    player_bowling = an.get_bowling_stats(deliveries_df, selected_player)
+    player_bowling = an.get_bowling_stats(deliveries_df, selected_player, matches_df, season_filter)
     
     if not player_bowling.empty:
         # Display metrics
@@ -93,12 +121,50 @@ with tab2:
         with col6:
             st.metric("Overs", f"{player_bowling['Overs'].values[0]:.1f}")
         
+        # Milestones
+        bowling_milestones = an.get_bowling_milestones(deliveries_df, selected_player, matches_df, season_filter)
+        if not bowling_milestones.empty:
+            col7, col8, col9, col10 = st.columns(4)
+            
+            with col7:
+                st.metric("Best Figures", bowling_milestones['Best_Figures'].values[0])
+            with col8:
+                st.metric("3-Wicket Hauls", int(bowling_milestones['Three_Wickets'].values[0]))
+            with col9:
+                st.metric("4-Wicket Hauls", int(bowling_milestones['Four_Wickets'].values[0]))
+            with col10:
+                st.metric("5-Wicket Hauls", int(bowling_milestones['Five_Wickets'].values[0]))
+        
         # Display detailed stats table
         st.markdown("#### Detailed Statistics")
         st.dataframe(player_bowling, use_container_width=True, hide_index=True)
     else:
         st.warning("No bowling statistics available for this player.")
 
+with tab3:
+    st.markdown(f"### Phase-wise Performance - {selected_player}")
+    st.caption("Powerplay: overs 1-6 • Middle: overs 7-15 • Death: overs 16-20 (all seasons)")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Batting")
+        batting_phases = an.get_player_phase_stats(deliveries_df, selected_player, 'batting')
+        if batting_phases['Balls'].sum() > 0:
+            viz.show_phase_stats(batting_phases, 'Strike_Rate')
+            st.dataframe(batting_phases, use_container_width=True, hide_index=True)
+        else:
+            st.info("No batting data for this player.")
+    
+    with col2:
+        st.markdown("#### Bowling")
+        bowling_phases = an.get_player_phase_stats(deliveries_df, selected_player, 'bowling')
+        if bowling_phases['Balls'].sum() > 0:
+            viz.show_phase_stats(bowling_phases, 'Economy')
+            st.dataframe(bowling_phases, use_container_width=True, hide_index=True)
+        else:
+            st.info("No bowling data for this player.")
+
 st.markdown("---")
 
 # Top performers section
@@ -114,4 +180,21 @@ with col1:
 with col2:
     st.markdown("#### Top 15 Wicket Takers")
     top_bowlers = an.get_top_wicket_takers(deliveries_df, 15)
-    st.dataframe(top_bowlers, use_container_width=True, hide_index=True)
\ No newline at end of file
+    st.dataframe(top_bowlers, use_container_width=True, hide_index=True)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("#### Top 10 Highest Scores")
+    top_scores = an.get_top_scores(deliveries_df, 10)
+    st.dataframe(top_scores, use_container_width=True, hide_index=True)
+
+with col2:
+    st.markdown("#### Five-Wicket Hauls")
+    wicket_hauls = an.get_wicket_hauls(deliveries_df, 5)
+    if not wicket_hauls.empty:
+        st.dataframe(wicket_hauls, use_container_width=True, hide_index=True)
+    else:
+        st.info("No five-wicket hauls in the dataset.")
+
+profiling.show_debug_panel("Player Analysis")
@@ -3,32 +3,36 @@ Team Performance Analysis Page
 """
 
 import streamlit as st
-import analysis as an
-import visualizations as viz
 
-st.set_page_config(page_title="Team Stats", page_icon="🏆", layout="wide")
-
-# Load data
-@st.cache_data
-def load_data():
-    return an.load_data()
+from page_shell import lazy_import
 
-matches_df, deliveries_df = load_data()
+an = lazy_import('analysis')
+viz = lazy_import('visualizations')
+profiling = lazy_import('profiling')
 
-if matches_df is None or deliveries_df is None:
-    st.error("⚠️ Data files not found!")
-    st.stop()
+st.set_page_config(page_title="Team Stats", page_icon="🏆", layout="wide")
 
 # ==================== TEAM ANALYSIS PAGE ====================
 
 st.title("🏆 Team Performance Analysis")
 
-# Get all teams
-all_teams = an.get_all_teams(matches_df)
+# Record timings of this run (only with IPL_PROFILE=1)
+profiling.start_run(an, viz)
+
+# The team list is read from data/.cache, without loading data
+all_teams = an.get_names('teams')
+
+if all_teams is None:
+    st.error("⚠️ Data files not found!")
+    st.stop()
 
 # Team selection
 selected_team = st.selectbox("Select a Team", all_teams, index=0)
 
+# Load the columns used on this page (shared across all pages)
+matches_df = an.get_matches(an.get_team_stats, an.get_team_performance_by_season, an.get_head_to_head,
+                            an.get_head_to_head_table)
+
 st.markdown("---")
 
 # Overall team stats
@@ -52,6 +56,29 @@ if not selected_team_stats.empty:
 
 st.markdown("---")
 
+# Phase-wise performance
+st.markdown(f"### Phase-wise Performance - {selected_team}")
+st.caption("Powerplay: overs 1-6 • Middle: overs 7-15 • Death: overs 16-20")
+
+# Ball-by-ball data is only needed here, for the columns of the phase table
+deliveries_df = an.get_deliveries(an.get_team_phase_stats)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("#### Batting")
+    batting_phases = an.get_team_phase_stats(deliveries_df, selected_team, 'batting')
+    viz.show_phase_stats(batting_phases, 'Run_Rate')
+    st.dataframe(batting_phases, use_container_width=True, hide_index=True)
+
+with col2:
+    st.markdown("#### Bowling")
+    bowling_phases = an.get_team_phase_stats(deliveries_df, selected_team, 'bowling')
+    viz.show_phase_stats(bowling_phases, 'Economy')
+    st.dataframe(bowling_phases, use_container_width=True, hide_index=True)
+
+st.markdown("---")
+
 # Season-wise performance
 st.markdown(f"### Season-wise Performance - {selected_team}")
 season_performance = an.get_team_performance_by_season(matches_df, selected_team)
@@ -109,4 +136,17 @@ if team1 != team2:
     # Head to head chart
     viz.show_head_to_head(h2h_stats, team1, team2)
 else:
-    st.warning("Please select two different teams for comparison.")
\ No newline at end of file
+    st.warning("Please select two different teams for comparison.")
+
+st.markdown("---")
+
+# Full head to head matrix
+st.markdown("### 🗺️ Full Head-to-Head")
+
+h2h_season = st.selectbox("Season", ["All Seasons"] + an.get_names('seasons'), key='h2h_season')
+h2h_table = an.get_head_to_head_table(matches_df, None if h2h_season == "All Seasons" else h2h_season)
+
+st.caption("Win percentage of each team (rows) against each opponent (columns)")
+viz.show_head_to_head_heatmap(h2h_table)
+
+profiling.show_debug_panel("Team Analysis")
@@ -0,0 +1,183 @@
+"""
+Parallel Statistics Engine
+This module computes league-wide batting and bowling statistics on several
+CPU cores, with the deliveries shared between processes through shared memory
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import analysis as an
+
+
+# Partitions per worker, so that uneven partitions still keep all workers busy
+PARTITIONS_PER_WORKER = 4
+
+
+# ==================== SHARED MEMORY FUNCTIONS ====================
+
+def _to_shared(arrays):
+    """
+    Copy arrays into shared memory blocks
+
+    Returns:
+        tuple: (list of SharedMemory blocks, spec used by workers to attach)
+    """
+    blocks = []
+    spec = {}
+    for name, values in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        blocks.append(block)
+        spec[name] = (block.name, values.dtype.str, len(values))
+    return blocks, spec
+
+
+def _attach(spec):
+    """Attach to the shared memory blocks described by spec"""
+    blocks = []
+    arrays = {}
+    for name, (block_name, dtype, length) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray((length,), dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _decode(codes, series, labels):
+    """Turn player codes back into an index of names, like a groupby on series"""
+    codes = np.asarray(codes)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        names = pd.Categorical.from_codes(codes, categories=labels)
+        return pd.CategoricalIndex(names, name=series.name)
+    return pd.Index(labels.take(codes), name=series.name)
+
+
+# ==================== WORKER FUNCTIONS ====================
+
+def _partition_counts(spec, labels, start, end):
+    """
+    Calculate batting and bowling counts for one partition of deliveries
+
+    Runs in a worker process. Players are identified by their integer code;
+    dismissed players are coded like batters so that the two can be matched.
+    """
+    blocks, arrays = _attach(spec)
+    try:
+        batters = pd.RangeIndex(labels['batters'])
+        partition = pd.DataFrame({
+            'match_id': arrays['match_id'][start:end],
+            'inning': arrays['inning'][start:end],
+            'batter': pd.Categorical.from_codes(arrays['batter'][start:end], categories=batters),
+            'bowler': arrays['bowler'][start:end],
+            'batsman_runs': arrays['batsman_runs'][start:end],
+            'total_runs': arrays['total_runs'][start:end],
+            'is_wicket': arrays['is_wicket'][start:end],
+            'extras_type': pd.Categorical.from_codes(arrays['extras_type'][start:end], categories=labels['extras']),
+            'player_dismissed': pd.Categorical.from_codes(arrays['player_dismissed'][start:end], categories=batters),
+            'dismissal_kind': pd.Categorical.from_codes(
+                arrays['dismissal_kind'][start:end], categories=labels['dismissals']
+            ),
+        })
+        return an.compute_batting_counts(partition), an.compute_bowling_counts(partition)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+# ==================== PARALLEL STATISTICS FUNCTIONS ====================
+
+def parallel_player_stats(deliveries_df, workers=None):
+    """
+    Calculate batting and bowling statistics for all players in parallel
+
+    Deliveries are sorted by match and split into partitions that never
+    share a match, so the partial counts of the partitions add up exactly.
+    The result is the same as get_batting_stats / get_bowling_stats.
+
+    Parameters:
+        deliveries_df: DataFrame with ball-by-ball data
+        workers: Number of worker processes (default: number of CPUs)
+
+    Returns:
+        tuple: (batting_stats_df, bowling_stats_df)
+    """
+    workers = workers or os.cpu_count() or 1
+
+    batter_codes, batter_labels = an._name_codes(deliveries_df['batter'])
+    bowler_codes, bowler_labels = an._name_codes(deliveries_df['bowler'])
+    extras_codes, extras_labels = an._name_codes(deliveries_df['extras_type'])
+    dismissal_codes, dismissal_labels = an._name_codes(deliveries_df['dismissal_kind'])
+    batter_dtype = deliveries_df['batter'].dtype
+    if isinstance(batter_dtype, pd.CategoricalDtype) and deliveries_df['player_dismissed'].dtype == batter_dtype:
+        # Both columns are encoded with the shared player vocabulary
+        dismissed_codes = deliveries_df['player_dismissed'].cat.codes.to_numpy()
+    else:
+        dismissed_codes = pd.Index(batter_labels).get_indexer(deliveries_df['player_dismissed'].astype(object))
+
+    match_ids = deliveries_df['match_id'].to_numpy()
+    order = np.argsort(match_ids, kind='stable')
+    arrays = {
+        'match_id': match_ids[order],
+        'inning': deliveries_df['inning'].to_numpy()[order],
+        'batter': batter_codes[order],
+        'bowler': bowler_codes[order],
+        'batsman_runs': deliveries_df['batsman_runs'].to_numpy()[order],
+        'total_runs': deliveries_df['total_runs'].to_numpy()[order],
+        'is_wicket': deliveries_df['is_wicket'].to_numpy()[order],
+        'extras_type': extras_codes[order],
+        'player_dismissed': dismissed_codes[order],
+        'dismissal_kind': dismissal_codes[order],
+    }
+    labels = {
+        'batters': len(batter_labels),
+        'extras': list(extras_labels),
+        'dismissals': list(dismissal_labels),
+    }
+    bounds = _partition_bounds(arrays['match_id'], workers * PARTITIONS_PER_WORKER)
+    if not bounds:
+        return an.get_batting_stats(deliveries_df), an.get_bowling_stats(deliveries_df)
+
+    blocks, spec = _to_shared(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_partition_counts, spec, labels, start, end)
+                for start, end in bounds
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    batting_counts = an.merge_counts([batting for batting, _ in results])
+    bowling_counts = an.merge_counts([bowling for _, bowling in results])
+    batting_counts.index = _decode(batting_counts.index, deliveries_df['batter'], batter_labels)
+    bowling_counts.index = _decode(bowling_counts.index, deliveries_df['bowler'], bowler_labels)
+
+    return an.build_batting_table(batting_counts), an.build_bowling_table(bowling_counts)
+
+
+def _partition_bounds(sorted_match_ids, partitions):
+    """
+    Split sorted match ids into about equal row ranges at match boundaries
+
+    Returns:
+        List of (start, end) row ranges
+    """
+    n_rows = len(sorted_match_ids)
+    if n_rows == 0:
+        return []
+
+    # Move every cut back to the first row of its match
+    targets = np.linspace(0, n_rows, partitions + 1).astype(int)[1:-1]
+    cuts = np.searchsorted(sorted_match_ids, sorted_match_ids[targets], side='left')
+    edges = np.unique(np.concatenate([[0], cuts, [n_rows]]))
+
+    return [(int(start), int(end)) for start, end in zip(edges[:-1], edges[1:]) if end > start]
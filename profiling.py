@@ -0,0 +1,259 @@
+"""
+Profiling Functions
+This module records how long the analysis and chart functions take on each
+run of a page, so slow pages can be traced to a data load, an aggregation or
+a chart
+
+Profiling is off unless the IPL_PROFILE environment variable is set:
+    IPL_PROFILE=1 streamlit run app.py
+
+Every page then shows a debug panel in the sidebar, and the timings of all
+runs are summed up in data/.cache/profile.json (or the file named by
+IPL_PROFILE_LOG).
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+PROFILE_ENV = 'IPL_PROFILE'
+PROFILE_LOG_ENV = 'IPL_PROFILE_LOG'
+PROFILE_LOG = os.path.join('data', '.cache', 'profile.json')
+
+# Calls kept per thread, so a thread that never finishes a run stays bounded
+MAX_RECORDS = 10_000
+
+logger = logging.getLogger(__name__)
+
+_LOCAL = threading.local()
+_TOTALS = {}
+_TOTALS_LOCK = threading.Lock()
+
+
+# ==================== RECORDING FUNCTIONS ====================
+
+def enabled():
+    """Check whether profiling was switched on with IPL_PROFILE"""
+    return os.environ.get(PROFILE_ENV, '') not in ('', '0')
+
+
+@contextmanager
+def profile_block(name, rows=0):
+    """
+    Record the wall time and memory change of a block of code
+
+    Blocks inside other blocks are recorded with a larger depth, so the
+    time of the outer block already includes them.
+
+    Parameters:
+        name: Name shown in the debug panel
+        rows: Number of rows the block scans
+
+    Yields:
+        Dictionary with the record, which the block may update (e.g. rows)
+    """
+    records = _records()
+    depth = getattr(_LOCAL, 'depth', 0)
+    record = {'name': name, 'depth': depth, 'rows': rows}
+
+    _LOCAL.depth = depth + 1
+    rss_before = _rss()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['ms'] = (time.perf_counter() - start) * 1000
+        record['rss_delta_mb'] = (_rss() - rss_before) / 1024 ** 2
+        _LOCAL.depth = depth
+        records.append(record)
+
+
+def timed(func=None, name=None):
+    """
+    Decorator that records every call of a function with profile_block
+
+    The rows scanned are the rows of the DataFrame and Series arguments;
+    functions without such arguments (loaders) count the rows they return.
+
+    Parameters:
+        func: Function to wrap
+        name: Name shown in the debug panel (default: module.function)
+
+    Returns:
+        Wrapped function
+    """
+    if func is None:
+        return functools.partial(timed, name=name)
+
+    label = name or f'{func.__module__}.{func.__name__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile_block(label, _count_rows(args, kwargs.values())) as record:
+            result = func(*args, **kwargs)
+            if not record['rows']:
+                record['rows'] = _count_rows(result if isinstance(result, tuple) else (result,))
+            return result
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def instrument(module):
+    """
+    Wrap every public function defined in a module with timed()
+
+    Calls between functions of the module go through the module globals,
+    so they are recorded as nested calls. Instrumenting a module twice has
+    no further effect.
+
+    Parameters:
+        module: Imported module (e.g. analysis, visualizations)
+    """
+    for attribute, value in list(vars(module).items()):
+        if (attribute.startswith('_') or not inspect.isfunction(value)
+                or value.__module__ != module.__name__ or getattr(value, '__profiled__', False)):
+            continue
+        setattr(module, attribute, timed(value, name=f'{module.__name__.split(".")[-1]}.{attribute}'))
+
+
+def _records():
+    """Records of the current thread (one Streamlit run)"""
+    if not hasattr(_LOCAL, 'records'):
+        _LOCAL.records = deque(maxlen=MAX_RECORDS)
+    return _LOCAL.records
+
+
+def _count_rows(*groups):
+    """Total length of the DataFrames and Series among the given values"""
+    return sum(
+        len(value)
+        for group in groups
+        for value in group
+        if isinstance(value, (pd.DataFrame, pd.Series))
+    )
+
+
+def _rss():
+    """Resident memory of the process in bytes (0 where it cannot be read)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+# ==================== RUN FUNCTIONS ====================
+
+def start_run(*modules):
+    """
+    Start recording a page run
+
+    Call at the top of a page, before any analysis function. Does nothing
+    unless profiling is enabled.
+
+    Parameters:
+        *modules: Modules to instrument (e.g. analysis, visualizations)
+    """
+    if not enabled():
+        return
+    for module in modules:
+        instrument(module)
+    _records().clear()
+    _LOCAL.depth = 0
+    _LOCAL.start = time.perf_counter()
+
+
+def finish_run(page):
+    """
+    Finish recording a page run and add it to the totals
+
+    Parameters:
+        page: Name of the page
+
+    Returns:
+        DataFrame with one row per recorded call, or None if profiling is off
+    """
+    if not enabled():
+        return None
+
+    records = pd.DataFrame(list(_records()), columns=['name', 'depth', 'ms', 'rows', 'rss_delta_mb'])
+    run_ms = (time.perf_counter() - getattr(_LOCAL, 'start', time.perf_counter())) * 1000
+    _records().clear()
+
+    with _TOTALS_LOCK:
+        page_totals = _TOTALS.setdefault(page, {'runs': 0, 'ms': 0.0, 'calls': {}})
+        page_totals['runs'] += 1
+        page_totals['ms'] += run_ms
+        for record in records.itertuples(index=False):
+            calls = page_totals['calls'].setdefault(record.name, {'count': 0, 'ms': 0.0, 'max_ms': 0.0, 'rows': 0})
+            calls['count'] += 1
+            calls['ms'] += record.ms
+            calls['max_ms'] = max(calls['max_ms'], record.ms)
+            calls['rows'] += int(record.rows)
+        _write_totals(os.environ.get(PROFILE_LOG_ENV) or PROFILE_LOG)
+
+    logger.info("%s rerun: %.1f ms, %d profiled calls", page, run_ms, len(records))
+    return records
+
+
+def get_totals():
+    """
+    Get the timings summed over all runs since the process started
+
+    Returns:
+        Dictionary mapping page name to runs, total ms and per-function calls
+    """
+    with _TOTALS_LOCK:
+        return json.loads(json.dumps(_TOTALS))
+
+
+def _write_totals(path):
+    """Write the totals to a JSON file, replacing it atomically"""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(_TOTALS, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write profile log %s: %s", path, e)
+
+
+# ==================== DEBUG PANEL FUNCTIONS ====================
+
+def show_debug_panel(page):
+    """
+    Finish the page run and show its timings in the sidebar
+
+    Call at the end of a page. Does nothing unless profiling is enabled.
+
+    Parameters:
+        page: Name of the page
+    """
+    records = finish_run(page)
+    if records is None:
+        return
+
+    import streamlit as st
+
+    top_level = records[records['depth'] == 0]
+    with st.sidebar.expander("🐞 Debug: timings", expanded=False):
+        st.caption(f"{len(records)} calls, {top_level['ms'].sum():.1f} ms in profiled functions")
+        summary = (
+            records.groupby('name')
+            .agg(calls=('ms', 'size'), total_ms=('ms', 'sum'), rows=('rows', 'sum'),
+                 rss_delta_mb=('rss_delta_mb', 'sum'))
+            .sort_values('total_ms', ascending=False)
+            .round(2)
+        )
+        st.dataframe(summary, use_container_width=True)
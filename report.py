@@ -0,0 +1,182 @@
+"""
+Batch Report Script
+Run this script to compute the statistics of every page for all teams,
+seasons and players in one batch and save them as JSON files (the
+derived arrays the pages are built from are saved as .npz files)
+
+Usage:
+    python report.py                       # write to data/reports/<dataset version>/
+    python report.py --output stat_packs   # write somewhere else
+
+The app preloads the league-wide tables and arrays of the report that
+matches the current CSV files (see analysis.load_report), so it does not
+build them when the first page is opened.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+import analysis as an
+import data_cache
+
+
+# Best innings kept in the top score and best figures lists
+TOP_N = 50
+
+
+# ==================== REPORT FUNCTIONS ====================
+
+def build_report(matches_df, deliveries_df):
+    """
+    Run the analysis functions of every page for the whole dataset
+
+    Parameters:
+        matches_df: DataFrame with match-level data
+        deliveries_df: DataFrame with ball-by-ball data
+
+    Returns:
+        Dictionary mapping artifact name to a DataFrame, Series or plain value
+    """
+    seasons = an.get_seasons(matches_df)
+    teams = an.get_all_teams(matches_df)
+    players = an.get_all_players(deliveries_df)
+
+    artifacts = {
+        # Derived tables preloaded by the app (see analysis.REPORT_TABLES)
+        'players': players,
+        'batting_table': an.get_league_batting_table(deliveries_df),
+        'bowling_table': an.get_league_bowling_table(deliveries_df),
+        'batting_milestones': an.get_batting_milestones(deliveries_df),
+        'bowling_milestones': an.get_bowling_milestones(deliveries_df),
+        'team_table': an.get_league_team_table(matches_df),
+        'venue_table': an.get_venue_stats(matches_df),
+        'season_matches': an.get_matches_by_season(matches_df),
+        'season_winners': an.get_season_winners(matches_df),
+        'toss_impact': an.get_toss_impact(matches_df),
+        'head_to_head_matrix': an.get_head_to_head_matrix(matches_df),
+        'batting_innings': an.get_batting_innings(deliveries_df),
+        'bowling_innings': an.get_bowling_innings(deliveries_df),
+        'phase_cube': an.get_phase_cube(deliveries_df),
+        'matchup_matrix': an.get_matchup_matrix(deliveries_df),
+
+        # League-wide lists
+        'seasons': [str(season) for season in seasons],
+        'teams': teams,
+        'head_to_head': an.get_head_to_head_table(matches_df),
+        'top_scores': an.get_top_scores(deliveries_df, TOP_N),
+        'best_figures': an.get_best_figures(deliveries_df, TOP_N),
+        'five_wicket_hauls': an.get_wicket_hauls(deliveries_df, 5),
+
+        # One table per season, stacked with a Season column
+        'batting_by_season': _stack(seasons, 'Season', lambda season: an.get_batting_stats(
+            deliveries_df, matches_df=matches_df, seasons=season)),
+        'bowling_by_season': _stack(seasons, 'Season', lambda season: an.get_bowling_stats(
+            deliveries_df, matches_df=matches_df, seasons=season)),
+        'team_stats_by_season': _stack(seasons, 'Season', lambda season: an.get_team_stats(
+            matches_df, seasons=season)),
+        'head_to_head_by_season': _stack(seasons, 'Season', lambda season: an.get_head_to_head_table(
+            matches_df, seasons=season)),
+        'venue_stats_by_season': _stack(seasons, 'Season', lambda season: an.get_venue_stats(
+            matches_df, seasons=season)),
+        'toss_impact_by_season': _stack(seasons, 'Season', lambda season: pd.DataFrame(
+            [an.get_toss_impact(matches_df, seasons=season)])),
+
+        # One table per team and per player
+        'team_performance_by_season': _stack(teams, 'Team', lambda team: an.get_team_performance_by_season(
+            matches_df, team)),
+        'team_phase_stats': _stack(teams, 'Team', lambda team: _phase_roles(
+            an.get_team_phase_stats, deliveries_df, team)),
+        'player_phase_stats': _stack(players, 'Player', lambda player: _phase_roles(
+            an.get_player_phase_stats, deliveries_df, player)),
+    }
+
+    return artifacts
+
+
+def _stack(keys, column, table_of):
+    """Concatenate the tables of several keys, with the key as first column"""
+    tables = []
+    for key in keys:
+        table = table_of(key)
+        tables.append(table.assign(**{column: str(key)})[[column, *table.columns]])
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=[column])
+
+
+def _phase_roles(phase_stats, deliveries_df, name):
+    """Batting and bowling phase statistics of a player or team in one table"""
+    return pd.concat([
+        phase_stats(deliveries_df, name, role).assign(Role=role)
+        for role in ('batting', 'bowling')
+    ], ignore_index=True)
+
+
+def write_report(matches_df, deliveries_df, artifacts, output=an.REPORT_DIR):
+    """
+    Save a report in the directory of its dataset version
+
+    Parameters:
+        matches_df: DataFrame the report was built from
+        deliveries_df: DataFrame the report was built from
+        artifacts: Dictionary returned by build_report
+        output: Directory holding all reports
+
+    Returns:
+        Path of the report directory
+    """
+    report_dir = an.report_path(matches_df, deliveries_df, output)
+    data_cache.write_artifacts(artifacts, report_dir, binary=an.REPORT_ARRAYS, meta={
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'matches_version': an.dataset_version(matches_df),
+        'deliveries_version': an.dataset_version(deliveries_df),
+        'sources': {
+            path: data_cache.describe_source(path)
+            for path in (an.MATCHES_CSV, an.DELIVERIES_CSV)
+        },
+    })
+    return report_dir
+
+
+# ==================== MAIN ====================
+
+def main():
+    """Parse the command line, build the report and save it"""
+    parser = argparse.ArgumentParser(description="Precompute the IPL statistics of every page")
+    parser.add_argument('--output', default=an.REPORT_DIR,
+                        help=f"Directory holding the reports (default: {an.REPORT_DIR})")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("IPL Statistics Report")
+    print("=" * 60)
+    print()
+
+    start = time.perf_counter()
+    matches_df, deliveries_df = an.load_data()
+    if matches_df is None or deliveries_df is None:
+        print("❌ ERROR: data/matches.csv or data/deliveries.csv not found!")
+        print("   Run validate_data.py for help with the dataset")
+        sys.exit(1)
+    print(f"📂 Loaded {len(matches_df):,} matches and {len(deliveries_df):,} deliveries "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    artifacts = build_report(matches_df, deliveries_df)
+    print(f"🧮 Computed {len(artifacts)} artifacts in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    report_dir = write_report(matches_df, deliveries_df, artifacts, args.output)
+    print(f"💾 Saved to {report_dir} in {time.perf_counter() - start:.2f} s")
+    print()
+
+    for name, value in artifacts.items():
+        size = f"{len(value):,} rows" if isinstance(value, (pd.DataFrame, pd.Series)) else f"{len(value):,} values"
+        print(f"   - {name}: {size}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Dataset Schema
+This module declares the column dtypes used to load the IPL CSV files
+"""
+
+# Numeric columns use the smallest integer type that fits the data and
+# string columns are categoricals: each distinct name is stored once and
+# every row only holds a small integer code.
+
+MATCHES_SCHEMA = {
+    'id': 'int32',
+    'season': 'category',
+    'city': 'category',
+    'date': 'object',
+    'match_type': 'category',
+    'player_of_match': 'category',
+    'venue': 'category',
+    'team1': 'category',
+    'team2': 'category',
+    'toss_winner': 'category',
+    'toss_decision': 'category',
+    'winner': 'category',
+    'result': 'category',
+    'result_margin': 'float32',
+    'target_runs': 'float32',
+    'target_overs': 'float32',
+    'super_over': 'category',
+    'method': 'category',
+    'umpire1': 'category',
+    'umpire2': 'category',
+}
+
+DELIVERIES_SCHEMA = {
+    'match_id': 'int32',
+    'inning': 'int8',
+    'batting_team': 'category',
+    'bowling_team': 'category',
+    'over': 'int8',
+    'ball': 'int8',
+    'batter': 'category',
+    'bowler': 'category',
+    'non_striker': 'category',
+    'batsman_runs': 'int8',
+    'extra_runs': 'int8',
+    'total_runs': 'int8',
+    'extras_type': 'category',
+    'is_wicket': 'int8',
+    'player_dismissed': 'category',
+    'dismissal_kind': 'category',
+    'fielder': 'category',
+}
+
+# Name columns that share one vocabulary across both files. The columns of a
+# vocabulary get the same categories, so a player's code is the same in
+# batter, bowler and player_dismissed and columns can be compared by code.
+
+VOCABULARIES = {
+    'players': {
+        'matches': ['player_of_match'],
+        'deliveries': ['batter', 'bowler', 'non_striker', 'player_dismissed', 'fielder'],
+    },
+    'teams': {
+        'matches': ['team1', 'team2', 'toss_winner', 'winner'],
+        'deliveries': ['batting_team', 'bowling_team'],
+    },
+    'venues': {
+        'matches': ['venue'],
+        'deliveries': [],
+    },
+}
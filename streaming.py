@@ -0,0 +1,169 @@
+"""
+Streaming Statistics
+This module computes league-wide statistics from CSV files that are too large
+to load at once, reading them in chunks and merging partial counts
+
+Run this script on any ball-by-ball file with the IPL column layout:
+    python streaming.py data/deliveries.csv --chunksize 100000
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+import analysis as an
+import schema
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Columns needed by the batting/bowling counts; names are read as plain
+# strings because categories inferred per chunk would not line up
+DELIVERIES_COLUMNS = [
+    'match_id', 'inning', 'batter', 'bowler', 'batsman_runs', 'total_runs',
+    'extras_type', 'is_wicket', 'player_dismissed', 'dismissal_kind'
+]
+MATCHES_COLUMNS = ['id', 'season', 'team1', 'team2', 'winner']
+
+
+# ==================== CHUNK READING FUNCTIONS ====================
+
+def iter_match_chunks(deliveries_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Read deliveries in chunks that never split a match
+
+    The rows of the last match in each chunk are held back and prepended to
+    the next chunk, so innings and match counts stay additive. The file
+    must keep the deliveries of a match on consecutive rows.
+
+    Parameters:
+        deliveries_path: Path to a deliveries CSV file
+        chunksize: Number of rows read per chunk
+
+    Yields:
+        DataFrame with the deliveries of whole matches
+    """
+    carry = None
+    reader = pd.read_csv(
+        deliveries_path,
+        usecols=DELIVERIES_COLUMNS,
+        dtype=_plain_dtypes(schema.DELIVERIES_SCHEMA, DELIVERIES_COLUMNS),
+        chunksize=chunksize
+    )
+
+    for chunk in reader:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+
+        last_match = chunk['match_id'].to_numpy() == chunk['match_id'].iloc[-1]
+        carry = chunk[last_match]
+        yield chunk[~last_match]
+
+    if carry is not None and len(carry):
+        yield carry
+
+
+def _plain_dtypes(dtypes, columns):
+    """Schema dtypes of the given columns, without categoricals"""
+    return {
+        column: dtypes[column]
+        for column in columns
+        if dtypes[column] != 'category'
+    }
+
+
+# ==================== STREAMING STATISTICS FUNCTIONS ====================
+
+def stream_player_stats(deliveries_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Calculate batting and bowling statistics for all players in one pass
+
+    Peak memory is one chunk plus one row of counts per player, whatever
+    the size of the file.
+
+    Parameters:
+        deliveries_path: Path to a deliveries CSV file
+        chunksize: Number of rows read per chunk
+
+    Returns:
+        tuple: (batting_stats_df, bowling_stats_df)
+    """
+    batting_counts = None
+    bowling_counts = None
+
+    for chunk in iter_match_chunks(deliveries_path, chunksize):
+        chunk_batting = an.compute_batting_counts(chunk)
+        chunk_bowling = an.compute_bowling_counts(chunk)
+
+        # Fold each chunk into the running state instead of keeping every part
+        if batting_counts is None:
+            batting_counts, bowling_counts = chunk_batting, chunk_bowling
+        else:
+            batting_counts = an.merge_counts([batting_counts, chunk_batting])
+            bowling_counts = an.merge_counts([bowling_counts, chunk_bowling])
+
+    if batting_counts is None:
+        return None, None
+    return an.build_batting_table(batting_counts), an.build_bowling_table(bowling_counts)
+
+
+def stream_team_stats(matches_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Calculate team statistics for all teams in one pass
+
+    Parameters:
+        matches_path: Path to a matches CSV file
+        chunksize: Number of rows read per chunk
+
+    Returns:
+        DataFrame with team statistics
+    """
+    team_counts = None
+    reader = pd.read_csv(
+        matches_path,
+        usecols=MATCHES_COLUMNS,
+        dtype=_plain_dtypes(schema.MATCHES_SCHEMA, MATCHES_COLUMNS),
+        chunksize=chunksize
+    )
+
+    # One row per match, so chunks never split a match
+    for chunk in reader:
+        chunk_counts = an.compute_team_counts(chunk)
+        if team_counts is None:
+            team_counts = chunk_counts
+        else:
+            team_counts = an.merge_counts([team_counts, chunk_counts])
+
+    if team_counts is None:
+        return None
+    return an.build_team_table(team_counts)
+
+
+def main():
+    """Print the top players of a deliveries file read in chunks"""
+    parser = argparse.ArgumentParser(description="Compute player statistics from a large deliveries CSV")
+    parser.add_argument('deliveries', help="Path to the deliveries CSV file")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Rows read per chunk")
+    parser.add_argument('--top', type=int, default=10, help="Number of players to show")
+    args = parser.parse_args()
+
+    try:
+        batting_stats, bowling_stats = stream_player_stats(args.deliveries, args.chunksize)
+    except FileNotFoundError:
+        print(f"❌ ERROR: {args.deliveries} not found!")
+        sys.exit(1)
+
+    if batting_stats is None:
+        print("❌ ERROR: the file has no deliveries")
+        sys.exit(1)
+
+    print(f"🏏 TOP {args.top} RUN SCORERS:")
+    print(batting_stats.head(args.top).to_string(index=False))
+    print()
+    print(f"⚾ TOP {args.top} WICKET TAKERS:")
+    print(bowling_stats.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
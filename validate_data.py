@@ -6,6 +6,8 @@ Run this script to verify your dataset is correctly loaded
 import pandas as pd
 import sys
 
+import schema
+
 def validate_data():
     """Validate that the CSV files are loaded correctly"""
     
@@ -75,6 +77,14 @@ def validate_data():
         print(f"   - Total wickets: {deliveries['is_wicket'].sum():,}")
         print()
         
+        # Memory usage with default dtypes vs. the declared schema
+        print("=" * 60)
+        print("Memory Usage")
+        print("=" * 60)
+        print()
+        print_memory_report('matches.csv', matches, 'data/matches.csv', schema.MATCHES_SCHEMA)
+        print_memory_report('deliveries.csv', deliveries, 'data/deliveries.csv', schema.DELIVERIES_SCHEMA)
+        
         # Sample data
         print("=" * 60)
         print("Sample Data Preview")
@@ -110,5 +120,18 @@ def validate_data():
         sys.exit(1)
 
 
+def print_memory_report(name, default_df, path, dtypes):
+    """Print the memory used by a CSV with default dtypes and with the schema"""
+    compact_df = pd.read_csv(path, dtype=dtypes)
+    before = default_df.memory_usage(deep=True).sum()
+    after = compact_df.memory_usage(deep=True).sum()
+    
+    print(f"💾 {name.upper()}:")
+    print(f"   - Default dtypes: {before / 1024 ** 2:,.1f} MB")
+    print(f"   - Schema dtypes:  {after / 1024 ** 2:,.1f} MB")
+    print(f"   - Reduction:      {(1 - after / before) * 100:.1f}%")
+    print()
+
+
 if __name__ == "__main__":
     validate_data()
\ No newline at end of file
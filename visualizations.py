@@ -3,6 +3,7 @@ Cricket Statistics Visualization Functions
 This module contains chart creation functions using Streamlit's native charts
 """
 
+import altair as alt
 import streamlit as st
 import pandas as pd
 
@@ -92,4 +93,48 @@ def show_head_to_head(h2h_data, team1, team2):
         'Wins': [h2h_data[f'{team1}_wins'], h2h_data[f'{team2}_wins'], h2h_data['ties']]
     })
     df = df.set_index('Team')
-    st.bar_chart(df)
\ No newline at end of file
+    st.bar_chart(df)
+
+
+def show_head_to_head_heatmap(h2h_table):
+    """
+    Display heatmap of the head-to-head records of all teams using Altair
+    
+    Parameters:
+        h2h_table: DataFrame from analysis.get_head_to_head_table
+    """
+    chart = alt.Chart(h2h_table).mark_rect().encode(
+        x=alt.X('Opponent:N', title='Opponent'),
+        y=alt.Y('Team:N', title='Team'),
+        color=alt.Color('Win_Percentage:Q', title='Win %', scale=alt.Scale(scheme='redyellowgreen', domain=[0, 100])),
+        tooltip=['Team', 'Opponent', 'Matches', 'Wins', 'Losses', 'No_Result', 'Win_Percentage']
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+
+def show_leaderboard(leaderboard_df, column):
+    """
+    Display bar chart of a leaderboard stat using Streamlit
+    
+    Parameters:
+        leaderboard_df: DataFrame with the top players
+        column: Name of the ranked stat column
+    """
+    chart_data = leaderboard_df[['Player', column]].set_index('Player')
+    st.bar_chart(chart_data)
+
+
+def show_phase_stats(phase_df, column):
+    """
+    Display bar chart of a stat in each phase of the innings using Altair
+    
+    Parameters:
+        phase_df: DataFrame with one row per phase (see analysis.get_player_phase_stats)
+        column: Name of the stat column
+    """
+    chart = alt.Chart(phase_df).mark_bar().encode(
+        x=alt.X('Phase:N', sort=list(phase_df['Phase']), title=None),
+        y=alt.Y(f'{column}:Q', title=column.replace('_', ' ')),
+        tooltip=list(phase_df.columns)
+    )
+    st.altair_chart(chart, use_container_width=True)